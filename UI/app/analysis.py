@@ -1,11 +1,18 @@
 import os
+import re
 import json
-from typing import Dict, Any, List
+import hashlib
+import logging
+import time
+from typing import Dict, Any, List, Tuple
 from fastapi import BackgroundTasks
-from pdfminer.high_level import extract_text as pdf_extract
-import docx
 import asyncio
 from openai import OpenAI
+from .extraction import extract_document
+from .result_cache import result_cache
+from .mapreduce import split_into_chunks, merge_chunk_results
+
+logger = logging.getLogger(__name__)
 
 roles = [
     {"role": "Corporate Lawyer"},
@@ -13,15 +20,41 @@ roles = [
     {"role": "Compliance Officer"},
 ]
 
-async def extract_text(path: str) -> str:
-    ext = os.path.splitext(path)[1].lower()
-    if ext == ".pdf":
-        return pdf_extract(path) or ""
-    if ext in [".docx"]:
-        d = docx.Document(path)
-        return "\n".join([p.text for p in d.paragraphs])
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        return f.read()
+ANALYSIS_MODEL = "gpt-4o-mini"
+ANALYSIS_SYSTEM_PROMPT = "You are a senior legal contract analyst."
+ANALYSIS_PROMPT = (
+    "Analyze the following contract text and return JSON with keys: "
+    "summary, classification, risk, missing, experts, suggestions, contract_type, risk_level. "
+    "classification requires keys: contract_type, industry, category, jurisdiction, duration. "
+    "risk requires keys: level, score, factors as array of {title,severity}. "
+    "missing requires array of {title, level, suggestion}. "
+    "experts must include exactly three personas: Corporate Lawyer, Risk Analyst, Compliance Officer. "
+    "Each persona appears once with fields {persona, score, key_findings[], recommendations[]}. "
+    "Avoid duplicated items. Keep results concise and professional."
+)
+CHUNK_PROMPT = (
+    "This is part {index} of {total} of a longer contract. Report only what appears in this part. "
+    "Also return clauses_present: array of titles of the standard clauses this part contains."
+)
+SUMMARY_PROMPT = (
+    "Combine these partial summaries of one contract into a single concise professional summary "
+    "of at most five sentences. Return plain text only."
+)
+# Token budget per chunk; documents that fit in one chunk are analyzed in a single call
+CHUNK_TOKENS = int(os.environ.get("LEGALAI_CHUNK_TOKENS", "3000"))
+MAP_CONCURRENCY = int(os.environ.get("LEGALAI_MAP_CONCURRENCY", "4"))
+# Changes whenever the model or prompt changes, so stale cached results are never served
+PROMPT_VERSION = hashlib.sha256(
+    (ANALYSIS_MODEL + ANALYSIS_SYSTEM_PROMPT + ANALYSIS_PROMPT + CHUNK_PROMPT + SUMMARY_PROMPT + str(CHUNK_TOKENS)).encode()
+).hexdigest()[:12]
+
+def analysis_cache_key(text: str) -> str:
+    normalized = re.sub(r"\s+", " ", text).strip()
+    return hashlib.sha256(f"{PROMPT_VERSION}:{normalized}".encode("utf-8")).hexdigest()
+
+async def extract_text(path: str) -> Tuple[str, List[str]]:
+    # Parsing runs in a process pool so large PDFs never block the event loop
+    return await extract_document(path)
 
 def _safe_openai_client():
     try:
@@ -134,23 +167,22 @@ async def _llm_analysis(text: str) -> Dict[str, Any]:
     client = _safe_openai_client()
     if not client:
         return _mock_analysis(text)
-    prompt = (
-        "Analyze the following contract text and return JSON with keys: "
-        "summary, classification, risk, missing, experts, suggestions, contract_type, risk_level. "
-        "classification requires keys: contract_type, industry, category, jurisdiction, duration. "
-        "risk requires keys: level, score, factors as array of {title,severity}. "
-        "missing requires array of {title, level, suggestion}. "
-        "experts must include exactly three personas: Corporate Lawyer, Risk Analyst, Compliance Officer. "
-        "Each persona appears once with fields {persona, score, key_findings[], recommendations[]}. "
-        "Avoid duplicated items. Keep results concise and professional."
-    )
-    msg = [{"role": "system", "content": "You are a senior legal contract analyst."},
-           {"role": "user", "content": prompt + "\n\n" + text[:8000]}]
-    resp = client.chat.completions.create(model="gpt-4o-mini", messages=msg, temperature=0.3)
-    try:
-        data = json.loads(resp.choices[0].message.content)
-    except Exception:
+    key = analysis_cache_key(text)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached
+    start = time.perf_counter()
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    chunks = split_into_chunks(text, CHUNK_TOKENS)
+    if len(chunks) == 1:
+        data = await _analyze_chunk(client, ANALYSIS_PROMPT, chunks[0], usage)
+    else:
+        data = await _map_reduce(client, chunks, usage)
+    if data is None:
         return _mock_analysis(text)
+    usage["chunks"] = len(chunks)
+    usage["wall_seconds"] = round(time.perf_counter() - start, 2)
+    data["usage"] = usage
     seen = set()
     uniq = []
     for item in data.get("experts", []):
@@ -160,19 +192,70 @@ async def _llm_analysis(text: str) -> Dict[str, Any]:
         seen.add(p)
         uniq.append(item)
     data["experts"] = uniq
+    # Always the full result, so every features projection can be served from one entry;
+    # a partial one is not kept, so the next run retries the sections that failed
+    if not usage.get("failed_chunks"):
+        result_cache.put(key, data)
+    return data
+
+def _add_usage(usage: Dict[str, int], resp):
+    u = getattr(resp, "usage", None)
+    if u:
+        usage["prompt_tokens"] += u.prompt_tokens or 0
+        usage["completion_tokens"] += u.completion_tokens or 0
+        usage["total_tokens"] += u.total_tokens or 0
+
+async def _analyze_chunk(client, prompt: str, text: str, usage: Dict[str, int]):
+    msg = [{"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+           {"role": "user", "content": prompt + "\n\n" + text}]
+    # The OpenAI client is synchronous; run it in a thread so calls overlap and the loop stays free
+    resp = await asyncio.to_thread(
+        client.chat.completions.create, model=ANALYSIS_MODEL, messages=msg, temperature=0.3,
+        response_format={"type": "json_object"},
+    )
+    _add_usage(usage, resp)
+    try:
+        return json.loads(resp.choices[0].message.content)
+    except Exception:
+        return None
+
+async def _map_reduce(client, chunks: List[str], usage: Dict[str, int]):
+    sem = asyncio.Semaphore(max(1, MAP_CONCURRENCY))
+    async def map_one(i: int, chunk: str):
+        async with sem:
+            prompt = ANALYSIS_PROMPT + " " + CHUNK_PROMPT.format(index=i + 1, total=len(chunks))
+            return await _analyze_chunk(client, prompt, chunk, usage)
+    # One failed call must not throw away the sections that were analyzed
+    results = await asyncio.gather(*[map_one(i, c) for i, c in enumerate(chunks)], return_exceptions=True)
+    parts = []
+    failed = 0
+    for i, p in enumerate(results):
+        if isinstance(p, BaseException):
+            failed += 1
+            logger.warning("Analysis of section %d/%d failed: %r", i + 1, len(chunks), p)
+        elif isinstance(p, dict):
+            parts.append(p)
+        else:
+            failed += 1
+            logger.warning("Analysis of section %d/%d returned no usable JSON", i + 1, len(chunks))
+    if not parts:
+        return None
+    usage["failed_chunks"] = failed
+    data = merge_chunk_results(parts, [r["role"] for r in roles])
+    try:
+        resp = await asyncio.to_thread(
+            client.chat.completions.create, model=ANALYSIS_MODEL, temperature=0.3,
+            messages=[{"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+                      {"role": "user", "content": SUMMARY_PROMPT + "\n\n" + "\n\n".join(p["summary"] for p in parts if isinstance(p.get("summary"), str))}],
+        )
+        _add_usage(usage, resp)
+        data["summary"] = resp.choices[0].message.content.strip() or data["summary"]
+    except Exception as e:
+        logger.warning("Summary of %d sections failed, keeping the merged one: %r", len(parts), e)
+    if failed:
+        data["warnings"] = [f"{failed} of {len(chunks)} sections could not be analyzed; the result covers the rest"]
     return data
 
-async def run_analysis(text: str, features: str = "full") -> Dict[str, Any]:
-    all_res = await _llm_analysis(text)
-    selected = set([x.strip().lower() for x in features.split(",")]) if features != "full" else {"full"}
-    res = {}
-    res["summary"] = all_res["summary"] if "full" in selected or "summary" in selected else ""
-    res["classification_json"] = json.dumps(all_res["classification"]) if "full" in selected or "classification" in selected else ""
-    res["risk_json"] = json.dumps(all_res["risk"]) if "full" in selected or "risk" in selected else ""
-    res["missing_json"] = json.dumps(all_res["missing"]) if "full" in selected or "missing" in selected else ""
-    res["experts_json"] = json.dumps(all_res["experts"]) if "full" in selected or "experts" in selected else ""
-    res["suggestions_json"] = json.dumps(all_res["suggestions"]) if "full" in selected or "suggestions" in selected else ""
-    res["full_json"] = json.dumps(all_res)
-    res["contract_type"] = all_res.get("classification", {}).get("contract_type", "-")
-    res["risk_level"] = all_res.get("risk", {}).get("level", "-")
-    return res
+async def run_analysis(text: str) -> Dict[str, Any]:
+    # Always the full result; the requested features are applied when the stored row is read
+    return await _llm_analysis(text)
@@ -1,63 +1,101 @@
 import os
+import glob
 import json
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from docx import Document
+import zlib
+import asyncio
+from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Iterator, Any, List, Tuple
 from .models import Analysis
 
-async def export_report(a: Analysis, fmt: str) -> str:
-    out_dir = os.path.join(os.getcwd(), "exports")
-    os.makedirs(out_dir, exist_ok=True)
-    base = os.path.splitext(a.filename)[0]
-    if fmt == "txt":
-        path = os.path.join(out_dir, base + ".txt")
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(a.summary or "")
-            if a.classification:
-                f.write("\n\nClassification\n")
-                f.write(a.classification)
-            if a.risk_assessment:
-                f.write("\n\nRisk\n")
-                f.write(a.risk_assessment)
-            if a.missing_clauses:
-                f.write("\n\nMissing Clauses\n")
-                f.write(a.missing_clauses)
-            if a.experts_review:
-                f.write("\n\nExperts Review\n")
-                f.write(a.experts_review)
-            if a.suggestions:
-                f.write("\n\nSuggestions\n")
-                f.write(a.suggestions)
-        return path
-    if fmt == "json":
-        path = os.path.join(out_dir, base + ".json")
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(a.json_result or "{}")
-        return path
-    if fmt == "docx":
-        path = os.path.join(out_dir, base + ".docx")
-        doc = Document()
-        doc.add_heading("Analysis Report", level=1)
-        doc.add_heading("Professional Summary", level=2)
-        doc.add_paragraph(a.summary or "")
-        if a.classification:
-            doc.add_heading("Smart Classification", level=2)
-            doc.add_paragraph(a.classification)
-        if a.risk_assessment:
-            doc.add_heading("Risk Assessment", level=2)
-            doc.add_paragraph(a.risk_assessment)
-        if a.missing_clauses:
-            doc.add_heading("Missing Clauses", level=2)
-            doc.add_paragraph(a.missing_clauses)
-        if a.experts_review:
-            doc.add_heading("Multi-Expert Review", level=2)
-            doc.add_paragraph(a.experts_review)
-        if a.suggestions:
-            doc.add_heading("Smart Suggestions", level=2)
-            doc.add_paragraph(a.suggestions)
-        doc.save(path)
-        return path
-    path = os.path.join(out_dir, base + ".pdf")
+EXPORT_DIR = os.path.join(os.getcwd(), "exports")
+EXPORT_WORKERS = int(os.environ.get("LEGALAI_EXPORT_WORKERS", "2"))
+EXPORT_FORMATS = ("pdf", "txt", "docx", "json", "ndjson")
+# Produced straight from the stored result without touching disk
+STREAM_FORMATS = ("txt", "json", "ndjson")
+STREAM_CHUNK_CHARS = 64 * 1024
+SECTIONS = [
+    ("classification", "Classification", "Smart Classification"),
+    ("risk_assessment", "Risk", "Risk Assessment"),
+    ("missing_clauses", "Missing Clauses", "Missing Clauses"),
+    ("experts_review", "Experts Review", "Multi-Expert Review"),
+    ("suggestions", "Suggestions", "Smart Suggestions"),
+]
+# Analysis property -> key in the stored result
+RESULT_KEYS = {"classification": "classification", "risk_assessment": "risk", "missing_clauses": "missing",
+               "experts_review": "experts", "suggestions": "suggestions"}
+
+_pool: Optional[ProcessPoolExecutor] = None
+# Renders in flight, so concurrent clicks on the same export share one render
+_pending: Dict[str, asyncio.Task] = {}
+stats = {"hits": 0, "renders": 0}
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=max(1, EXPORT_WORKERS))
+    return _pool
+
+def shutdown_export_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def export_format(fmt: str) -> str:
+    return fmt if fmt in EXPORT_FORMATS else "pdf"
+
+def download_name(a: Analysis, fmt: str) -> str:
+    return os.path.splitext(a.filename)[0] + "." + export_format(fmt)
+
+def content_disposition_header(filename: str) -> str:
+    # Same form FileResponse uses, for responses that are not backed by a file
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+def artifact_path(a: Analysis, fmt: str) -> str:
+    # One directory per analysis and one file per revision, so nothing is shared between analyses
+    stamp = a.updated_at.strftime("%Y%m%dT%H%M%S%f") if a.updated_at else "0"
+    return os.path.join(EXPORT_DIR, str(a.id), f"{stamp}.{export_format(fmt)}")
+
+def _snapshot(a: Analysis) -> Dict[str, str]:
+    # Plain strings only; the ORM object cannot cross into a worker process
+    data = {key: getattr(a, key) for key, _, _ in SECTIONS}
+    data["summary"] = a.summary
+    data["json_result"] = a.json_result
+    return data
+
+# The functions below run inside pool worker processes
+
+def _render_txt(data: Dict[str, str], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data["summary"] or "")
+        for key, title, _ in SECTIONS:
+            if data[key]:
+                f.write(f"\n\n{title}\n")
+                f.write(data[key])
+
+def _render_json(data: Dict[str, str], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data["json_result"] or "{}")
+
+def _render_docx(data: Dict[str, str], path: str):
+    from docx import Document
+    doc = Document()
+    doc.add_heading("Analysis Report", level=1)
+    doc.add_heading("Professional Summary", level=2)
+    doc.add_paragraph(data["summary"] or "")
+    for key, _, title in SECTIONS:
+        if data[key]:
+            doc.add_heading(title, level=2)
+            doc.add_paragraph(data[key])
+    doc.save(path)
+
+def _render_pdf(data: Dict[str, str], path: str):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
     c = canvas.Canvas(path, pagesize=letter)
     width, height = letter
     y = height - 50
@@ -75,16 +113,105 @@ async def export_report(a: Analysis, fmt: str) -> str:
                 c.showPage()
                 y = height - 50
     write("Analysis Report")
-    write(a.summary or "", "Professional Summary")
-    if a.classification:
-        write(a.classification, "Smart Classification")
-    if a.risk_assessment:
-        write(a.risk_assessment, "Risk Assessment")
-    if a.missing_clauses:
-        write(a.missing_clauses, "Missing Clauses")
-    if a.experts_review:
-        write(a.experts_review, "Multi-Expert Review")
-    if a.suggestions:
-        write(a.suggestions, "Smart Suggestions")
+    write(data["summary"] or "", "Professional Summary")
+    for key, _, title in SECTIONS:
+        if data[key]:
+            write(data[key], title)
     c.save()
+
+RENDERERS = {"txt": _render_txt, "json": _render_json, "docx": _render_docx, "pdf": _render_pdf}
+
+def _render(fmt: str, data: Dict[str, str], path: str):
+    # Write beside the target and rename, so a half-written file is never served
+    tmp = f"{path}.{os.getpid()}.tmp"
+    RENDERERS[fmt](data, tmp)
+    os.replace(tmp, path)
+
+def _drop_stale(path: str):
+    for old in glob.glob(os.path.join(os.path.dirname(path), "*")):
+        if old != path and not old.endswith(".tmp") and os.path.splitext(old)[1] == os.path.splitext(path)[1]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+async def _render_async(fmt: str, data: Dict[str, str], path: str) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    await asyncio.get_running_loop().run_in_executor(get_pool(), _render, fmt, data, path)
+    stats["renders"] += 1
+    _drop_stale(path)
     return path
+
+async def export_report(a: Analysis, fmt: str) -> str:
+    fmt = export_format(fmt)
+    path = artifact_path(a, fmt)
+    if os.path.exists(path):
+        stats["hits"] += 1
+        return path
+    task = _pending.get(path)
+    if task is None:
+        task = asyncio.ensure_future(_render_async(fmt, _snapshot(a), path))
+        _pending[path] = task
+        task.add_done_callback(lambda _: _pending.pop(path, None))
+    else:
+        stats["hits"] += 1
+    # shield: one client disconnecting must not cancel a render others are waiting on
+    return await asyncio.shield(task)
+
+def stream_sections(a: Analysis) -> List[Tuple[str, str, Any]]:
+    # Resolved up front: the generators below run after the request's session is closed
+    return [("summary", "summary", a.section("summary"))] + [
+        (key, RESULT_KEYS[key], a.section(RESULT_KEYS[key])) for key, _, _ in SECTIONS
+    ]
+
+def _iter_txt(sections) -> Iterator[str]:
+    titles = {key: title for key, title, _ in SECTIONS}
+    for key, _, value in sections:
+        if key == "summary":
+            yield value or ""
+        elif value is not None:
+            yield f"\n\n{titles[key]}\n"
+            yield json.dumps(value)
+
+def _iter_json(result: Dict[str, Any]) -> Iterator[str]:
+    # iterencode yields small pieces as it walks the result; batch them into chunks
+    buf: List[str] = []
+    size = 0
+    for piece in json.JSONEncoder().iterencode(result or {}):
+        buf.append(piece)
+        size += len(piece)
+        if size >= STREAM_CHUNK_CHARS:
+            yield "".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield "".join(buf)
+
+def _iter_ndjson(sections) -> Iterator[str]:
+    # One record per line; list sections get one line per item so consumers can process them incrementally
+    for _, name, value in sections:
+        if value is None:
+            continue
+        items = value if isinstance(value, list) else [value]
+        for item in items:
+            yield json.dumps({"section": name, "data": item}) + "\n"
+
+def stream_export(a: Analysis, fmt: str, gzip: bool = False) -> Iterator[bytes]:
+    if fmt == "json":
+        pieces = _iter_json(a.result if a.result_blob else {})
+    else:
+        sections = stream_sections(a)
+        pieces = _iter_ndjson(sections) if fmt == "ndjson" else _iter_txt(sections)
+    return _encode(pieces, gzip)
+
+def _encode(pieces: Iterator[str], gzip: bool) -> Iterator[bytes]:
+    if not gzip:
+        for piece in pieces:
+            if piece:
+                yield piece.encode("utf-8")
+        return
+    z = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for piece in pieces:
+        if piece:
+            # Sync flush per chunk so the client receives data as it is produced
+            yield z.compress(piece.encode("utf-8")) + z.flush(zlib.Z_SYNC_FLUSH)
+    yield z.flush()
@@ -0,0 +1,115 @@
+import os
+import sys
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+# The shared extraction package lives at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import contract_extract
+
+EXTRACT_WORKERS = int(os.environ.get("LEGALAI_EXTRACT_WORKERS", str(os.cpu_count() or 2)))
+EXTRACT_TIMEOUT = float(os.environ.get("LEGALAI_EXTRACT_TIMEOUT", "120"))
+EXTRACT_MAX_BYTES = int(os.environ.get("LEGALAI_EXTRACT_MAX_BYTES", str(50 * 1024 * 1024)))
+EXTRACT_MAX_PAGES = int(os.environ.get("LEGALAI_EXTRACT_MAX_PAGES", "500"))
+# Large PDFs are split into page ranges of this size and parsed in parallel
+PAGES_PER_TASK = int(os.environ.get("LEGALAI_EXTRACT_PAGES_PER_TASK", "16"))
+
+class ExtractionError(Exception):
+    pass
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=max(1, EXTRACT_WORKERS))
+    return _pool
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def recycle_pool():
+    # A timed-out parse keeps running in its worker; killing the pool is the only way to get the worker back
+    global _pool
+    old, _pool = _pool, None
+    if old is None:
+        return
+    processes = list((getattr(old, "_processes", None) or {}).values())
+    # Not cancel_futures: other documents' pending calls should fail with BrokenProcessPool and retry
+    old.shutdown(wait=False)
+    for p in processes:
+        if p.is_alive():
+            p.kill()
+
+# The functions below run inside pool worker processes
+
+def _pdf_page_count(path: str) -> int:
+    return contract_extract.page_count(path)
+
+def _pdf_pages(path: str, pages: List[int]) -> List[str]:
+    return list(contract_extract.iter_pages(path, pages=pages))
+
+def _cached_pages(path: str) -> Optional[List[str]]:
+    return contract_extract.cached_pages(path)
+
+def _store_pages(path: str, pages: List[str]):
+    contract_extract.store_pages(path, pages)
+
+def _docx_text(path: str) -> str:
+    return contract_extract.extract_text(path)
+
+def _plain_text(path: str, max_bytes: int) -> str:
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read(max_bytes)
+
+def extraction_stats() -> dict:
+    store = contract_extract.get_store()
+    return store.get_statistics() if store is not None else {"enabled": False}
+
+async def _run(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_pool(), fn, *args)
+
+async def _extract(path: str, ext: str, max_pages: int) -> Tuple[str, List[str]]:
+    if ext == ".pdf":
+        # A document any project already parsed comes from the shared text store
+        pages = await _run(_cached_pages, path)
+        if pages is None:
+            count = await _run(_pdf_page_count, path)
+            total = min(count, max_pages)
+            ranges = [list(range(i, min(i + PAGES_PER_TASK, total))) for i in range(0, total, PAGES_PER_TASK)]
+            parts = await asyncio.gather(*[_run(_pdf_pages, path, r) for r in ranges])
+            # gather keeps submission order, so pages are stitched back in order
+            pages = [page for part in parts for page in part]
+            if total == count:
+                await _run(_store_pages, path, pages)
+        else:
+            count = len(pages)
+        warnings = []
+        if count > max_pages:
+            warnings.append(f"Only the first {max_pages} of {count} pages were analyzed (page limit {max_pages})")
+        return "\n".join(page for page in pages[:max_pages] if page), warnings
+    if ext == ".docx":
+        return await _run(_docx_text, path), []
+    return await _run(_plain_text, path, EXTRACT_MAX_BYTES), []
+
+async def extract_document(path: str, timeout: float = EXTRACT_TIMEOUT, max_pages: int = EXTRACT_MAX_PAGES) -> Tuple[str, List[str]]:
+    """Returns the text and warnings about anything that was left out."""
+    size = os.path.getsize(path)
+    if size > EXTRACT_MAX_BYTES:
+        raise ExtractionError(f"File is {size} bytes, limit is {EXTRACT_MAX_BYTES}")
+    ext = os.path.splitext(path)[1].lower()
+    for attempt in range(2):
+        try:
+            return await asyncio.wait_for(_extract(path, ext, max_pages), timeout=timeout)
+        except asyncio.TimeoutError:
+            recycle_pool()
+            raise ExtractionError(f"Extraction of {os.path.basename(path)} timed out after {timeout}s")
+        except BrokenProcessPool:
+            # Another document's timeout recycled the pool under this one; retry once on the fresh pool
+            if attempt:
+                raise ExtractionError(f"Extraction of {os.path.basename(path)} failed: worker pool was restarted")
@@ -0,0 +1,185 @@
+import os
+import uuid
+import socket
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import and_, or_
+from .database import SessionLocal
+from .models import Analysis
+from .analysis import run_analysis
+from .uploads import extract_upload_text
+from .stats import record_completed
+
+ANALYSIS_WORKERS = int(os.environ.get("LEGALAI_ANALYSIS_WORKERS", "2"))
+ANALYSIS_QUEUE_SIZE = int(os.environ.get("LEGALAI_ANALYSIS_QUEUE_SIZE", "20"))
+# Progress of finished jobs is also in the DB, so only a bounded tail is kept in memory
+PROGRESS_HISTORY = 1000
+# Statuses a job passes through before it finishes; rows left in one of these were interrupted
+PENDING_STATUSES = ("Queued", "Extracting", "Analyzing")
+# Every process refreshes heartbeat_at on the unfinished jobs it owns this often...
+JOB_HEARTBEAT_SECONDS = float(os.environ.get("LEGALAI_JOB_HEARTBEAT_SECONDS", "15"))
+# ...and a job whose heartbeat is older than this is taken to belong to a dead process and is reclaimed
+JOB_STALE_SECONDS = float(os.environ.get("LEGALAI_JOB_STALE_SECONDS", "90"))
+# Unique per process start: a restarted process (or a reused PID in a container) never passes for its predecessor
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+class QueueFull(Exception):
+    pass
+
+class AnalysisJobQueue:
+    def __init__(self, workers: int = ANALYSIS_WORKERS, max_pending: int = ANALYSIS_QUEUE_SIZE):
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.queue: Optional[asyncio.Queue] = None
+        self.tasks = []
+        self.progress: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self.recovery: List[asyncio.Task] = []
+        self.heartbeat: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.tasks:
+            return
+        self.queue = asyncio.Queue(maxsize=self.max_pending)
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self.heartbeat = asyncio.create_task(self._heartbeat())
+
+    async def stop(self):
+        background = self.recovery + ([self.heartbeat] if self.heartbeat else [])
+        for t in self.tasks + background:
+            t.cancel()
+        await asyncio.gather(*self.tasks, *background, return_exceptions=True)
+        self.tasks, self.recovery, self.heartbeat = [], [], None
+
+    def full(self) -> bool:
+        return self.queue is None or self.queue.full()
+
+    def submit(self, analysis_id: int, path: str):
+        if self.full():
+            raise QueueFull()
+        # No await between the full() check and here, so this cannot race
+        self.queue.put_nowait((analysis_id, path))
+        self._set(analysis_id, "Queued", 0)
+
+    def recover(self):
+        # Jobs only live in memory, so anything a dead process left unfinished is requeued or failed here
+        self.recovery = [t for t in self.recovery if not t.done()]
+        jobs = claim_interrupted()
+        if jobs:
+            for analysis_id, _ in jobs:
+                self._set(analysis_id, "Queued", 0)
+            self.recovery.append(asyncio.create_task(self._requeue(jobs)))
+
+    async def _heartbeat(self):
+        # Also sweeps for jobs of processes that died while this one kept running
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                await asyncio.to_thread(beat)
+                self.recover()
+            except Exception as e:
+                print(f"Job heartbeat failed: {e}")
+
+    async def _requeue(self, jobs: List[Tuple[int, str]]):
+        # put() waits for room, so recovered jobs never push the queue past its bound
+        for job in jobs:
+            await self.queue.put(job)
+
+    def status(self, analysis_id: int) -> Dict[str, Any]:
+        return self.progress.get(analysis_id, {})
+
+    def _set(self, analysis_id: int, stage: str, progress: int, error: str = ""):
+        self.progress[analysis_id] = {"stage": stage, "progress": progress, "error": error}
+        self.progress.move_to_end(analysis_id)
+        while len(self.progress) > PROGRESS_HISTORY:
+            self.progress.popitem(last=False)
+
+    async def _worker(self):
+        while True:
+            analysis_id, path = await self.queue.get()
+            try:
+                await self._process(analysis_id, path)
+            except Exception as e:
+                self._set(analysis_id, "Failed", 100, str(e))
+                _update(analysis_id, status="Failed", error=str(e))
+            finally:
+                self.queue.task_done()
+
+    async def _process(self, analysis_id: int, path: str):
+        self._set(analysis_id, "Extracting", 10)
+        _update(analysis_id, status="Extracting")
+        text, warnings = await extract_upload_text(path)
+        self._set(analysis_id, "Analyzing", 40)
+        _update(analysis_id, status="Analyzing")
+        result = await run_analysis(text)
+        if warnings:
+            # Kept with the result, so the results page and exports say what was left out
+            result = {**result, "warnings": warnings + result.get("warnings", [])}
+        self._set(analysis_id, "Saving", 90)
+        _update(
+            analysis_id,
+            result=result,
+            contract_type=result.get("classification", {}).get("contract_type", "-"),
+            risk_level=result.get("risk", {}).get("level", "-"),
+            status="Completed",
+        )
+        self._set(analysis_id, "Completed", 100)
+
+def _update(analysis_id: int, **fields):
+    db = SessionLocal()
+    try:
+        a = db.query(Analysis).filter(Analysis.id == analysis_id).first()
+        if not a:
+            return
+        was_completed = a.status == "Completed"
+        for k, v in fields.items():
+            setattr(a, k, v)
+        if a.status == "Completed" and not was_completed:
+            record_completed(db, a)
+        db.commit()
+    finally:
+        db.close()
+
+def beat():
+    """Mark every unfinished job this process owns as still alive."""
+    db = SessionLocal()
+    try:
+        db.query(Analysis).filter(Analysis.owner == WORKER_ID, Analysis.status.in_(PENDING_STATUSES)).update(
+            # updated_at is kept as is, so it still says when the job last changed
+            {Analysis.heartbeat_at: datetime.utcnow(), Analysis.updated_at: Analysis.updated_at}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+def claim_interrupted() -> List[Tuple[int, str]]:
+    """Requeue-or-fail every unfinished row whose owner stopped heartbeating; returns the (id, upload path) jobs this process now owns."""
+    db = SessionLocal()
+    jobs = []
+    try:
+        cutoff = datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+        # Rows from before heartbeats were recorded fall back to updated_at
+        stale = or_(
+            Analysis.heartbeat_at < cutoff,
+            and_(Analysis.heartbeat_at.is_(None), or_(Analysis.updated_at < cutoff, Analysis.updated_at.is_(None))),
+        )
+        interrupted = (Analysis.status.in_(PENDING_STATUSES), or_(Analysis.owner.is_(None), Analysis.owner != WORKER_ID), stale)
+        rows = db.query(Analysis.id, Analysis.upload_path).filter(*interrupted).order_by(Analysis.id).all()
+        for analysis_id, path in rows:
+            requeue = bool(path) and os.path.exists(path)
+            fields = {Analysis.status: "Queued", Analysis.owner: WORKER_ID, Analysis.heartbeat_at: datetime.utcnow()}
+            if not requeue:
+                fields = {**fields, Analysis.status: "Failed", Analysis.error: "Interrupted by a server restart and the upload is no longer available; please upload the document again"}
+            # The conditional update is atomic: once one process has set a fresh heartbeat, the row no longer
+            # matches for anyone else. A job is only taken over after its owner missed heartbeats for
+            # JOB_STALE_SECONDS, so a live worker's jobs are never run twice
+            claimed = db.query(Analysis).filter(Analysis.id == analysis_id, *interrupted).update(fields, synchronize_session=False)
+            db.commit()
+            if claimed and requeue:
+                jobs.append((analysis_id, path))
+    finally:
+        db.close()
+    return jobs
+
+job_queue = AnalysisJobQueue()
@@ -1,20 +1,37 @@
 import os
 from fastapi import FastAPI, Request, Depends, UploadFile, File, Form
-from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.templating import Jinja2Templates
-from sqlalchemy.orm import Session
-from .database import Base, engine, SessionLocal
-from .models import Analysis, User
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session, load_only
+from datetime import datetime
+from typing import Optional
+from .database import SessionLocal
+from .models import Analysis, User, LISTING_COLUMNS
 from .auth import router as auth_router, get_db
 from .utils import hash_password, verify_password
 from .analysis import run_analysis, extract_text
-from .exporter import export_report
+from .exporter import export_report, export_format, download_name, content_disposition_header, stream_export, shutdown_export_pool, STREAM_FORMATS, stats as export_stats
+from .jobs import job_queue, QueueFull, WORKER_ID
+from .extraction import shutdown_pool, extraction_stats
+from .uploads import save_upload, UploadTooLarge
+from .result_cache import result_cache
+from .migrations import upgrade
+from .stats import rebuild_counters, dashboard_stats, record_created
 from .utils import get_current_user
 
 secret = os.environ.get("LEGALAI_SECRET", "changeme-secret")
-Base.metadata.create_all(bind=engine)
+HISTORY_PAGE_SIZE = int(os.environ.get("LEGALAI_HISTORY_PAGE_SIZE", "50"))
+EXPORT_MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "txt": "text/plain; charset=utf-8",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+upgrade()
 
 app = FastAPI()
 app.add_middleware(SessionMiddleware, secret_key=secret, session_cookie="legalai_session", https_only=False, max_age=60*60*8)
@@ -24,6 +41,23 @@ templates = Jinja2Templates(directory=os.path.join(os.getcwd(), "templates"))
 app.include_router(auth_router)
 pwd_ctx = None
 
+@app.on_event("startup")
+async def start_job_queue():
+    db = SessionLocal()
+    try:
+        # Resync once at startup in case rows were changed outside the app
+        rebuild_counters(db)
+    finally:
+        db.close()
+    await job_queue.start()
+    job_queue.recover()
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    await job_queue.stop()
+    shutdown_pool()
+    shutdown_export_pool()
+
 def db_dep():
     db = SessionLocal()
     try:
@@ -41,27 +75,11 @@ async def login_page(request: Request):
 
 @app.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(request: Request, db: Session = Depends(db_dep)):
-    total = db.query(Analysis).count()
-    completed = db.query(Analysis).filter(Analysis.status == "Completed").count()
-    high_risk = db.query(Analysis).filter(Analysis.risk_level == "High").count()
-    recent = db.query(Analysis).order_by(Analysis.created_at.desc()).limit(5).all()
+    # Counters are maintained as analyses are created and completed, so this is constant-time
+    stats = dashboard_stats(db)
+    recent = db.query(Analysis).options(load_only(*LISTING_COLUMNS)).order_by(Analysis.created_at.desc(), Analysis.id.desc()).limit(5).all()
     user = {"name": "Guest"}
-    # This month count
-    from datetime import datetime
-    now = datetime.utcnow()
-    this_month = db.query(Analysis).filter(Analysis.created_at >= datetime(now.year, now.month, 1)).count()
-    # Distribution
-    low = db.query(Analysis).filter(Analysis.risk_level == "Low").count()
-    med = db.query(Analysis).filter(Analysis.risk_level == "Medium").count()
-    hi = high_risk
-    denom = total if total > 0 else 1
-    dist = {
-        "low": low, "medium": med, "high": hi,
-        "low_pct": int(low * 100 / denom),
-        "medium_pct": int(med * 100 / denom),
-        "high_pct": int(hi * 100 / denom)
-    }
-    return templates.TemplateResponse("dashboard.html", {"request": request, "user": user, "total": total, "completed": completed, "high_risk": high_risk, "recent": recent, "this_month": this_month, "dist": dist})
+    return templates.TemplateResponse("dashboard.html", {"request": request, "user": user, "recent": recent, **stats})
 
 @app.get("/analyze", response_class=HTMLResponse)
 async def analyze_page(request: Request):
@@ -69,63 +87,87 @@ async def analyze_page(request: Request):
 
 @app.post("/analyze", response_class=HTMLResponse)
 async def analyze_submit(request: Request, file: UploadFile = File(...), features: str = Form("full"), db: Session = Depends(db_dep)):
-    content = await file.read()
-    tmp_dir = os.path.join(os.getcwd(), "uploads")
-    os.makedirs(tmp_dir, exist_ok=True)
-    path = os.path.join(tmp_dir, file.filename)
-    with open(path, "wb") as f:
-        f.write(content)
-    text = await extract_text(path)
-    analysis = Analysis(user_id=None, filename=file.filename, status="Analyzing", features=features)
+    if job_queue.full():
+        return JSONResponse({"error": "Analysis queue is full, please retry shortly"}, status_code=429, headers={"Retry-After": "30"})
+    try:
+        path, sha, _ = await save_upload(file)
+    except UploadTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+    analysis = Analysis(user_id=None, filename=file.filename, status="Queued", features=features, upload_path=path, upload_sha256=sha,
+                        owner=WORKER_ID, heartbeat_at=datetime.utcnow())
     db.add(analysis)
+    db.flush()
+    record_created(db, analysis)
     db.commit()
     db.refresh(analysis)
-    result = await run_analysis(text, features)
-    analysis.summary = result["summary"]
-    analysis.classification = result.get("classification_json", "")
-    analysis.risk_assessment = result.get("risk_json", "")
-    analysis.missing_clauses = result.get("missing_json", "")
-    analysis.experts_review = result.get("experts_json", "")
-    analysis.suggestions = result.get("suggestions_json", "")
-    analysis.json_result = result["full_json"]
-    analysis.status = "Completed"
-    analysis.contract_type = result.get("contract_type", "-")
-    analysis.risk_level = result.get("risk_level", "-")
-    db.commit()
+    try:
+        job_queue.submit(analysis.id, path)
+    except QueueFull:
+        analysis.status = "Failed"
+        analysis.error = "Analysis queue is full"
+        db.commit()
+        return JSONResponse({"error": "Analysis queue is full, please retry shortly"}, status_code=429, headers={"Retry-After": "30"})
+    if "application/json" in request.headers.get("accept", ""):
+        return JSONResponse({"analysis_id": analysis.id, "status": analysis.status, "status_url": f"/status/{analysis.id}"}, status_code=202)
     return RedirectResponse(f"/results/{analysis.id}", status_code=303)
 
+@app.get("/status/{analysis_id}")
+async def analysis_status(analysis_id: int, db: Session = Depends(db_dep)):
+    a = db.query(Analysis).filter(Analysis.id == analysis_id).first()
+    if not a:
+        return JSONResponse({"error": "not found"}, status_code=404)
+    job = job_queue.status(analysis_id)
+    progress = job.get("progress", 100 if a.status in ("Completed", "Failed") else 0)
+    return {"analysis_id": a.id, "status": a.status, "stage": job.get("stage", a.status), "progress": progress, "error": job.get("error") or a.error or ""}
+
 @app.get("/results/{analysis_id}", response_class=HTMLResponse)
 async def results_page(analysis_id: int, request: Request, db: Session = Depends(db_dep)):
     a = db.query(Analysis).filter(Analysis.id == analysis_id).first()
     if not a:
         return RedirectResponse("/history")
-    import json
-    cls = json.loads(a.classification) if a.classification else {}
-    risk = json.loads(a.risk_assessment) if a.risk_assessment else {}
-    miss = json.loads(a.missing_clauses) if a.missing_clauses else []
-    exp = json.loads(a.experts_review) if a.experts_review else []
-    sug = json.loads(a.suggestions) if a.suggestions else []
+    cls = a.section("classification") or {}
+    risk = a.section("risk") or {}
+    miss = a.section("missing") or []
+    exp = a.section("experts") or []
+    sug = a.section("suggestions") or []
     return templates.TemplateResponse("results.html", {"request": request, "user": {"name":"Guest"}, "item": a, "cls": cls, "risk": risk, "miss": miss, "exp": exp, "sug": sug})
 
 @app.get("/history", response_class=HTMLResponse)
-async def history_page(request: Request, db: Session = Depends(db_dep)):
-    items = db.query(Analysis).order_by(Analysis.created_at.desc()).all()
-    return templates.TemplateResponse("history.html", {"request": request, "user": {"name":"Guest"}, "items": items})
+async def history_page(request: Request, after: Optional[str] = None, size: int = HISTORY_PAGE_SIZE, db: Session = Depends(db_dep)):
+    size = max(1, min(size, 500))
+    q = db.query(Analysis).options(load_only(*LISTING_COLUMNS)).order_by(Analysis.created_at.desc(), Analysis.id.desc())
+    if after:
+        # Cursor is "<created_at iso>_<id>" of the last row on the previous page
+        try:
+            ts, last_id = after.rsplit("_", 1)
+            ts, last_id = datetime.fromisoformat(ts), int(last_id)
+        except ValueError:
+            return RedirectResponse("/history")
+        q = q.filter(or_(Analysis.created_at < ts, and_(Analysis.created_at == ts, Analysis.id < last_id)))
+    rows = q.limit(size + 1).all()
+    items = rows[:size]
+    next_cursor = f"{items[-1].created_at.isoformat()}_{items[-1].id}" if len(rows) > size else None
+    total = dashboard_stats(db)["total"]
+    return templates.TemplateResponse("history.html", {"request": request, "user": {"name":"Guest"}, "items": items, "total": total, "next_cursor": next_cursor, "size": size, "first_page": not after})
 
 @app.get("/export/{analysis_id}")
 async def export(analysis_id: int, fmt: str, request: Request, db: Session = Depends(db_dep)):
     a = db.query(Analysis).filter(Analysis.id == analysis_id).first()
     if not a:
         return RedirectResponse("/history")
+    filename = download_name(a, fmt)
+    fmt = export_format(fmt)
+    media_type = EXPORT_MEDIA_TYPES.get(fmt, "application/octet-stream")
+    if fmt in STREAM_FORMATS:
+        # Chunked from the stored result; nothing is written to disk
+        gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+        headers = {"Content-Disposition": content_disposition_header(filename), "Vary": "Accept-Encoding"}
+        if gzip:
+            headers["Content-Encoding"] = "gzip"
+        return StreamingResponse(stream_export(a, fmt, gzip), media_type=media_type, headers=headers)
     path = await export_report(a, fmt)
-    filename = os.path.basename(path)
-    media_type = "application/octet-stream"
-    if fmt == "pdf":
-        media_type = "application/pdf"
-    elif fmt == "txt":
-        media_type = "text/plain"
-    elif fmt == "docx":
-        media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    elif fmt == "json":
-        media_type = "application/json"
     return FileResponse(path, media_type=media_type, filename=filename)
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {**result_cache.stats(), "exports": dict(export_stats), "extraction": extraction_stats()}
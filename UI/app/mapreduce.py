@@ -0,0 +1,111 @@
+import re
+from typing import Dict, Any, List
+from .models import _to_int
+
+SEVERITY_RANK = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+LEVEL_RANK = {"optional": 1, "important": 2, "critical": 3}
+
+def estimate_tokens(text: str) -> int:
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    except Exception:
+        # About four characters per token for English prose
+        return len(text) // 4 + 1
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    max_chars = max_tokens * 4
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    paragraphs = [p for p in re.split(r"\n\s*\n", text) if p.strip()]
+    chunks, current = [], ""
+    for p in paragraphs:
+        while len(p) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            cut = p.rfind(". ", 0, max_chars)
+            cut = cut + 1 if cut > max_chars // 2 else max_chars
+            chunks.append(p[:cut])
+            p = p[cut:].lstrip()
+        if current and len(current) + len(p) + 2 > max_chars:
+            chunks.append(current)
+            current = p
+        else:
+            current = f"{current}\n\n{p}" if current else p
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _norm(title: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", (title or "").lower()).strip()
+
+def _dedupe(items: List[Dict[str, Any]], rank_key: str = "", ranks: Dict[str, int] = None) -> List[Dict[str, Any]]:
+    out: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        k = _norm(item.get("title", ""))
+        if not k:
+            continue
+        if k not in out:
+            out[k] = item
+        elif rank_key and ranks.get(str(item.get(rank_key, "")).lower(), 0) > ranks.get(str(out[k].get(rank_key, "")).lower(), 0):
+            out[k] = item
+    return list(out.values())
+
+def _unique(values: List[str]) -> List[str]:
+    seen, out = set(), []
+    for v in values:
+        k = _norm(v)
+        if k and k not in seen:
+            seen.add(k)
+            out.append(v)
+    return out
+
+def _dicts(value) -> List[Dict[str, Any]]:
+    # Model output is untrusted: keep only the well-formed entries of a list
+    return [v for v in value if isinstance(v, dict)] if isinstance(value, list) else []
+
+def _strings(value) -> List[str]:
+    return [v for v in value if isinstance(v, str)] if isinstance(value, list) else []
+
+def _section(part: Dict[str, Any], key: str) -> Dict[str, Any]:
+    value = part.get(key)
+    return value if isinstance(value, dict) else {}
+
+def merge_chunk_results(parts: List[Dict[str, Any]], roles: List[str]) -> Dict[str, Any]:
+    parts = [p for p in parts if isinstance(p, dict)]
+    # Classification comes from the first chunk (parties, title, recitals); later chunks only fill gaps
+    classification: Dict[str, Any] = {}
+    for p in parts:
+        for k, v in _section(p, "classification").items():
+            if v and str(v).lower() != "unknown" and not classification.get(k):
+                classification[k] = v
+    factors = _dedupe([f for p in parts for f in _dicts(_section(p, "risk").get("factors"))], "severity", SEVERITY_RANK)
+    factors.sort(key=lambda f: -SEVERITY_RANK.get(str(f.get("severity", "")).lower(), 0))
+    score = max([_to_int(_section(p, "risk").get("score")) or 0 for p in parts] or [0])
+    level = "Low" if score < 30 else "Medium" if score < 70 else "High"
+    # A clause is only missing if no part of the document contains it
+    present = {_norm(t) for p in parts for t in _strings(p.get("clauses_present"))}
+    missing = [m for m in _dedupe([m for p in parts for m in _dicts(p.get("missing"))], "level", LEVEL_RANK) if _norm(m.get("title")) not in present]
+    experts = []
+    for role in roles:
+        entries = [e for p in parts for e in _dicts(p.get("experts")) if e.get("persona") == role]
+        if not entries:
+            continue
+        experts.append({
+            "persona": role,
+            "score": max(_to_int(e.get("score")) or 0 for e in entries),
+            "key_findings": _unique([x for e in entries for x in _strings(e.get("key_findings"))]),
+            "recommendations": _unique([x for e in entries for x in _strings(e.get("recommendations"))]),
+        })
+    suggestions = _dedupe([s for p in parts for s in _dicts(p.get("suggestions"))])
+    return {
+        "summary": " ".join(_unique([p["summary"] for p in parts if isinstance(p.get("summary"), str)])),
+        "classification": classification,
+        "risk": {"level": level, "score": score, "factors": factors},
+        "missing": missing,
+        "experts": experts,
+        "suggestions": suggestions,
+        "contract_type": classification.get("contract_type", "-"),
+        "risk_level": level,
+    }
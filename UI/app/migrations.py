@@ -0,0 +1,101 @@
+import json
+from typing import Dict, Any, Tuple
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
+from .database import Base, engine, SQLITE_BUSY_TIMEOUT_MS
+from .models import Analysis, encode_result, promoted_columns
+from .stats import ensure_indexes
+
+# Per-section JSON strings written by earlier versions, plus the full result again in json_result
+LEGACY_COLUMNS = ("summary", "classification", "risk_assessment", "missing_clauses", "experts_review", "suggestions", "json_result")
+LEGACY_SECTIONS = {"classification": "classification", "risk_assessment": "risk", "missing_clauses": "missing", "experts_review": "experts", "suggestions": "suggestions"}
+# Other workers wait this long for the first one to finish creating or migrating the schema
+SCHEMA_LOCK_TIMEOUT_MS = 600000
+NEW_COLUMNS = ("result_blob", "risk_score", "missing_count", "risk_factor_count", "upload_path", "upload_sha256", "error", "owner", "heartbeat_at")
+
+def _columns(conn) -> set:
+    return {c["name"] for c in inspect(conn).get_columns("analyses")}
+
+def _legacy_result(row) -> Dict[str, Any]:
+    if row.json_result:
+        try:
+            return json.loads(row.json_result)
+        except ValueError:
+            pass
+    # No full copy; rebuild from whichever sections were stored
+    data = {"summary": row.summary or ""}
+    for col, key in LEGACY_SECTIONS.items():
+        value = getattr(row, col)
+        if value:
+            data[key] = json.loads(value)
+    return data
+
+def _lock_schema(conn):
+    # Every uvicorn worker runs this at import; only one may create or alter tables at a time
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql(f"PRAGMA busy_timeout={SCHEMA_LOCK_TIMEOUT_MS}")
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        conn.exec_driver_sql(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    elif conn.dialect.name == "postgresql":
+        conn.exec_driver_sql("SELECT pg_advisory_xact_lock(hashtext('legalai_schema'))")
+
+def _migrate_rows(conn, legacy, batch_size: int) -> Tuple[int, int]:
+    cols = ", ".join(["id"] + [c if c in legacy else f"NULL AS {c}" for c in LEGACY_COLUMNS])
+    migrated, failed, last_id = 0, 0, 0
+    while True:
+        rows = conn.execute(text(
+            f"SELECT {cols} FROM analyses WHERE id > :last AND result_blob IS NULL ORDER BY id LIMIT :n"
+        ), {"last": last_id, "n": batch_size}).fetchall()
+        if not rows:
+            return migrated, failed
+        updates = []
+        for row in rows:
+            try:
+                data = _legacy_result(row)
+            except ValueError:
+                # Left in its legacy columns, which are then kept
+                failed += 1
+                continue
+            if data.get("summary") or len(data) > 1:
+                updates.append({"id": row.id, "result_blob": encode_result(data), **promoted_columns(data)})
+        if updates:
+            conn.execute(text(
+                "UPDATE analyses SET result_blob = :result_blob, risk_score = :risk_score, "
+                "missing_count = :missing_count, risk_factor_count = :risk_factor_count WHERE id = :id"
+            ), updates)
+        migrated += len(updates)
+        last_id = rows[-1].id
+
+def upgrade(batch_size: int = 500, drop_legacy: bool = False) -> Dict[str, Any]:
+    """
+    Create or bring the schema up to date, folding legacy rows into result_blob. Safe to run repeatedly.
+
+    The legacy columns are only dropped with drop_legacy=True, which scripts/migrate_results.py
+    passes after backing the database up, and only once every row has been folded.
+    """
+    stats = {"added_columns": [], "migrated_rows": 0, "unmigrated_rows": 0, "dropped_columns": []}
+    with engine.connect() as conn:
+        _lock_schema(conn)
+        Base.metadata.create_all(bind=conn)
+        existing = _columns(conn)
+        # create_all() does not add columns to a table that already exists
+        for name in NEW_COLUMNS:
+            if name not in existing:
+                sql_type = Analysis.__table__.c[name].type.compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE analyses ADD COLUMN {name} {sql_type}"))
+                stats["added_columns"].append(name)
+        ensure_indexes(conn)
+
+        legacy = [c for c in LEGACY_COLUMNS if c in existing]
+        if legacy:
+            stats["migrated_rows"], stats["unmigrated_rows"] = _migrate_rows(conn, legacy, batch_size)
+        if drop_legacy and not stats["unmigrated_rows"]:
+            for col in legacy:
+                try:
+                    conn.execute(text(f"ALTER TABLE analyses DROP COLUMN {col}"))
+                    stats["dropped_columns"].append(col)
+                except OperationalError:
+                    # SQLite before 3.35 cannot drop columns; release the space instead
+                    conn.execute(text(f"UPDATE analyses SET {col} = NULL"))
+        conn.commit()
+    return stats
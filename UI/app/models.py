@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+import json
+import zlib
+from sqlalchemy import Column, Integer, String, DateTime, Text, LargeBinary, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -19,16 +21,112 @@ class Analysis(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     filename = Column(String(255), nullable=False)
     contract_type = Column(String(255), default="-")
-    risk_level = Column(String(50), default="-")
-    status = Column(String(50), default="Analyzing")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    risk_level = Column(String(50), default="-", index=True)
+    status = Column(String(50), default="Analyzing", index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     features = Column(String(255), default="")
-    summary = Column(Text, default="")
-    classification = Column(Text, default="")
-    risk_assessment = Column(Text, default="")
-    missing_clauses = Column(Text, default="")
-    experts_review = Column(Text, default="")
-    suggestions = Column(Text, default="")
-    json_result = Column(Text, default="")
+    # Full analysis result stored once as zlib-compressed JSON; section views are derived from it
+    result_blob = Column(LargeBinary)
+    risk_score = Column(Integer, index=True)
+    missing_count = Column(Integer, index=True)
+    risk_factor_count = Column(Integer)
+    # Where the queued upload lives, so unfinished jobs can be requeued after a restart
+    upload_path = Column(String(1024))
+    upload_sha256 = Column(String(64), index=True)
+    error = Column(Text)
+    # Worker process that owns an unfinished job, and when it last confirmed it is still alive
+    owner = Column(String(128))
+    heartbeat_at = Column(DateTime)
     user = relationship("User", back_populates="analyses")
+    # Keyset pagination on the history page walks this index
+    __table_args__ = (Index("ix_analyses_created_at_id", "created_at", "id"),)
+
+    @property
+    def result(self) -> dict:
+        # Decoded once per loaded instance
+        if getattr(self, "_result", None) is None:
+            self._result = decode_result(self.result_blob)
+        return self._result
+
+    @result.setter
+    def result(self, data: dict):
+        self._result = data
+        self.result_blob = encode_result(data)
+        for k, v in promoted_columns(data).items():
+            setattr(self, k, v)
+
+    def section(self, key: str):
+        # Sections outside the requested features are hidden, as if never analyzed
+        selected = {x.strip().lower() for x in (self.features or "full").split(",")}
+        if "full" not in selected and key not in selected:
+            return None
+        return self.result.get(key)
+
+    @property
+    def summary(self) -> str:
+        return self.section("summary") or ""
+
+    @property
+    def classification(self) -> str:
+        return _dumps(self.section("classification"))
+
+    @property
+    def risk_assessment(self) -> str:
+        return _dumps(self.section("risk"))
+
+    @property
+    def missing_clauses(self) -> str:
+        return _dumps(self.section("missing"))
+
+    @property
+    def experts_review(self) -> str:
+        return _dumps(self.section("experts"))
+
+    @property
+    def suggestions(self) -> str:
+        return _dumps(self.section("suggestions"))
+
+    @property
+    def json_result(self) -> str:
+        return json.dumps(self.result) if self.result_blob else ""
+
+def encode_result(data: dict) -> bytes:
+    return zlib.compress(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), 6)
+
+def decode_result(blob) -> dict:
+    return json.loads(zlib.decompress(blob).decode("utf-8")) if blob else {}
+
+def promoted_columns(data: dict) -> dict:
+    # Values copied out of the blob so they can be filtered and sorted in SQL
+    risk = data.get("risk") or {}
+    return {
+        "risk_score": _to_int(risk.get("score")),
+        "risk_factor_count": len(risk.get("factors") or []),
+        "missing_count": len(data.get("missing") or []),
+    }
+
+def _dumps(value) -> str:
+    return json.dumps(value) if value is not None else ""
+
+def _to_int(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+# Columns shown in listings; the large Text fields stay deferred
+LISTING_COLUMNS = (Analysis.id, Analysis.filename, Analysis.contract_type, Analysis.risk_level, Analysis.status, Analysis.created_at)
+
+class AnalysisCacheEntry(Base):
+    __tablename__ = "analysis_cache"
+    key = Column(String(64), primary_key=True)
+    result = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+    hits = Column(Integer, default=0)
+
+class DashboardCounter(Base):
+    __tablename__ = "dashboard_counters"
+    name = Column(String(64), primary_key=True)
+    value = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,91 @@
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+from .database import SessionLocal
+from .models import AnalysisCacheEntry
+
+RESULT_CACHE_TTL = int(os.environ.get("LEGALAI_RESULT_CACHE_TTL", str(7 * 24 * 3600)))
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("LEGALAI_RESULT_CACHE_MAX_ENTRIES", "1000"))
+
+class ResultCache:
+    def __init__(self, ttl_seconds: int = RESULT_CACHE_TTL, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        db = SessionLocal()
+        try:
+            e = db.query(AnalysisCacheEntry).filter(AnalysisCacheEntry.key == key).first()
+            now = datetime.utcnow()
+            if e and e.created_at and now - e.created_at > self.ttl:
+                db.delete(e)
+                db.commit()
+                e = None
+                self._count("evictions")
+            if not e:
+                self._count("misses")
+                return None
+            e.hits = (e.hits or 0) + 1
+            e.last_used_at = now
+            db.commit()
+            self._count("hits")
+            return json.loads(e.result)
+        finally:
+            db.close()
+
+    def put(self, key: str, result: Dict[str, Any]):
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            e = db.query(AnalysisCacheEntry).filter(AnalysisCacheEntry.key == key).first()
+            if e:
+                e.result = json.dumps(result)
+                e.created_at = now
+                e.last_used_at = now
+            else:
+                db.add(AnalysisCacheEntry(key=key, result=json.dumps(result), created_at=now, last_used_at=now, hits=0))
+            db.commit()
+            self._evict(db, now)
+        finally:
+            db.close()
+
+    def _evict(self, db, now: datetime):
+        expired = db.query(AnalysisCacheEntry).filter(AnalysisCacheEntry.created_at < now - self.ttl).delete(synchronize_session=False)
+        over = db.query(AnalysisCacheEntry).count() - self.max_entries
+        removed = 0
+        if over > 0:
+            # Least recently used entries go first
+            stale = db.query(AnalysisCacheEntry.key).order_by(AnalysisCacheEntry.last_used_at.asc()).limit(over).all()
+            removed = db.query(AnalysisCacheEntry).filter(AnalysisCacheEntry.key.in_([k for (k,) in stale])).delete(synchronize_session=False)
+        db.commit()
+        if expired or removed:
+            self._count("evictions", expired + removed)
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    def stats(self) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            entries = db.query(AnalysisCacheEntry).count()
+        finally:
+            db.close()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": int(self.ttl.total_seconds()),
+            "max_entries": self.max_entries,
+        }
+
+result_cache = ResultCache()
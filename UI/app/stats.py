@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Dict, Any
+from sqlalchemy import func, case
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .database import engine
+from .models import Analysis, DashboardCounter
+
+def _month_key(dt: datetime) -> str:
+    return f"month:{dt.year:04d}-{dt.month:02d}"
+
+def ensure_indexes(bind=engine):
+    # create_all() does not add indexes to a table that already exists
+    for idx in Analysis.__table__.indexes:
+        idx.create(bind=bind, checkfirst=True)
+
+def aggregate_stats(db: Session) -> Dict[str, int]:
+    now = datetime.utcnow()
+    month_start = datetime(now.year, now.month, 1)
+    row = db.query(
+        func.count(Analysis.id),
+        func.sum(case((Analysis.status == "Completed", 1), else_=0)),
+        func.sum(case((Analysis.risk_level == "Low", 1), else_=0)),
+        func.sum(case((Analysis.risk_level == "Medium", 1), else_=0)),
+        func.sum(case((Analysis.risk_level == "High", 1), else_=0)),
+        func.sum(case((Analysis.created_at >= month_start, 1), else_=0)),
+    ).one()
+    total, completed, low, med, hi, this_month = [int(x or 0) for x in row]
+    return {"total": total, "completed": completed, "risk:Low": low, "risk:Medium": med, "risk:High": hi, _month_key(now): this_month}
+
+def rebuild_counters(db: Session):
+    counts = aggregate_stats(db)
+    db.query(DashboardCounter).delete()
+    for name, value in counts.items():
+        _upsert(db, name, value, increment=False)
+    db.commit()
+
+def _upsert(db: Session, name: str, value: int, increment: bool):
+    # Another worker may create the same row first (a new month, a rebuild), so never check-then-insert
+    new_value = DashboardCounter.value + value if increment else value
+    dialect = {"sqlite": sqlite, "postgresql": postgresql}.get(db.get_bind().dialect.name)
+    if dialect is not None:
+        stmt = dialect.insert(DashboardCounter).values(name=name, value=value)
+        db.execute(stmt.on_conflict_do_update(index_elements=[DashboardCounter.name], set_={"value": new_value}))
+        return
+    query = db.query(DashboardCounter).filter(DashboardCounter.name == name)
+    if query.update({DashboardCounter.value: new_value}, synchronize_session=False):
+        return
+    try:
+        with db.begin_nested():
+            db.add(DashboardCounter(name=name, value=value))
+    except IntegrityError:
+        query.update({DashboardCounter.value: new_value}, synchronize_session=False)
+
+def _bump(db: Session, name: str, n: int = 1):
+    _upsert(db, name, n, increment=True)
+
+# Both hooks run inside the caller's transaction, so counters commit together with the row
+def record_created(db: Session, a: Analysis):
+    _bump(db, "total")
+    _bump(db, _month_key(a.created_at or datetime.utcnow()))
+
+def record_completed(db: Session, a: Analysis):
+    _bump(db, "completed")
+    if a.risk_level in ("Low", "Medium", "High"):
+        _bump(db, f"risk:{a.risk_level}")
+
+def dashboard_stats(db: Session) -> Dict[str, Any]:
+    rows = dict(db.query(DashboardCounter.name, DashboardCounter.value).all())
+    if "total" not in rows:
+        rebuild_counters(db)
+        rows = dict(db.query(DashboardCounter.name, DashboardCounter.value).all())
+    total = rows.get("total", 0)
+    low, med, hi = rows.get("risk:Low", 0), rows.get("risk:Medium", 0), rows.get("risk:High", 0)
+    denom = total if total > 0 else 1
+    return {
+        "total": total,
+        "completed": rows.get("completed", 0),
+        "high_risk": hi,
+        "this_month": rows.get(_month_key(datetime.utcnow()), 0),
+        "dist": {
+            "low": low, "medium": med, "high": hi,
+            "low_pct": int(low * 100 / denom),
+            "medium_pct": int(med * 100 / denom),
+            "high_pct": int(hi * 100 / denom)
+        },
+    }
@@ -0,0 +1,46 @@
+import os
+import hashlib
+import aiofiles
+from typing import List, Tuple
+from fastapi import UploadFile
+from .analysis import extract_text
+
+UPLOAD_DIR = os.path.join(os.getcwd(), "uploads")
+MAX_UPLOAD_BYTES = int(os.environ.get("LEGALAI_MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+CHUNK_SIZE = 1024 * 1024
+
+class UploadTooLarge(Exception):
+    pass
+
+async def save_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> Tuple[str, str, int]:
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    digest = hashlib.sha256()
+    size = 0
+    tmp = os.path.join(UPLOAD_DIR, f".incoming-{os.getpid()}-{id(file)}{ext}")
+    try:
+        async with aiofiles.open(tmp, "wb") as out:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                await out.write(chunk)
+        sha = digest.hexdigest()
+        path = os.path.join(UPLOAD_DIR, sha + ext)
+        if os.path.exists(path):
+            os.remove(tmp)
+        else:
+            os.replace(tmp, path)
+        return path, sha, size
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+async def extract_upload_text(path: str) -> Tuple[str, List[str]]:
+    # Extracted text is kept in the shared contract_extract store, keyed by content hash like the uploads themselves
+    return await extract_text(path)
@@ -0,0 +1,43 @@
+import httpx, os, sys, time, threading, statistics
+
+# Usage: python scripts/bench_extraction.py path/to/large.pdf
+# Measures /dashboard latency before and while a large document is uploaded and parsed.
+base = "http://127.0.0.1:8003"
+pdf_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.getcwd(), "exports", "document.pdf")
+
+def sample_latency(seconds):
+    out = []
+    with httpx.Client(base_url=base) as c:
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            t = time.perf_counter()
+            c.get("/dashboard")
+            out.append((time.perf_counter() - t) * 1000)
+    return out
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+def report(label, values):
+    print(f"{label:<22} n={len(values):<5} p50={statistics.median(values):7.1f}ms p99={pct(values, 99):7.1f}ms max={max(values):7.1f}ms")
+
+baseline = sample_latency(5)
+report("idle", baseline)
+
+def upload():
+    with httpx.Client(base_url=base, timeout=600, headers={"accept": "application/json"}) as c:
+        with open(pdf_path, "rb") as f:
+            r = c.post("/analyze", files={"file": (os.path.basename(pdf_path), f, "application/pdf")}, data={"features": "full"})
+        aid = r.json()["analysis_id"]
+        while c.get(f"/status/{aid}").json()["status"] not in ("Completed", "Failed"):
+            time.sleep(0.5)
+
+t = threading.Thread(target=upload)
+start = time.perf_counter()
+t.start()
+during = []
+while t.is_alive():
+    during.extend(sample_latency(1))
+print(f"document processed in {time.perf_counter() - start:.1f}s")
+report("while parsing", during)
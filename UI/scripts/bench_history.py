@@ -0,0 +1,55 @@
+import os, sys, time, tempfile, statistics
+from datetime import datetime, timedelta
+
+# Usage: python scripts/bench_history.py [rows]
+# Seeds a throwaway database and times /history pages at increasing depths.
+rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+workdir = tempfile.mkdtemp()
+os.environ["LEGALAI_DB_PATH"] = os.path.join(workdir, "bench.db")
+sys.path.insert(0, os.getcwd())
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import engine, SessionLocal
+from app.models import Analysis
+
+big = '{"summary": "' + "x" * 4000 + '"}'
+start = datetime(2024, 1, 1)
+t = time.perf_counter()
+with engine.begin() as conn:
+    batch = []
+    for i in range(rows):
+        batch.append({"filename": f"contract_{i}.pdf", "contract_type": "MSA", "risk_level": ("Low", "Medium", "High")[i % 3],
+                      "status": "Completed", "created_at": start + timedelta(seconds=i), "updated_at": start + timedelta(seconds=i),
+                      "features": "full", "summary": big, "classification": big, "risk_assessment": big, "missing_clauses": big,
+                      "experts_review": big, "suggestions": big, "json_result": big})
+        if len(batch) == 5000:
+            conn.execute(Analysis.__table__.insert(), batch)
+            batch = []
+    if batch:
+        conn.execute(Analysis.__table__.insert(), batch)
+print(f"seeded {rows} rows in {time.perf_counter() - t:.1f}s ({os.path.getsize(os.environ['LEGALAI_DB_PATH']) / 1e6:.0f} MB)")
+
+def cursor_at(offset):
+    db = SessionLocal()
+    try:
+        a = db.query(Analysis.created_at, Analysis.id).order_by(Analysis.created_at.desc(), Analysis.id.desc()).offset(offset).limit(1).one()
+        return f"{a.created_at.isoformat()}_{a.id}"
+    finally:
+        db.close()
+
+with TestClient(app) as c:
+    for depth in [0, 1000, 10000, rows // 2, rows - 100]:
+        url = "/history" if depth == 0 else f"/history?after={cursor_at(depth)}"
+        timings = []
+        for _ in range(5):
+            t = time.perf_counter()
+            r = c.get(url)
+            timings.append((time.perf_counter() - t) * 1000)
+        print(f"page after row {depth:>7}: status={r.status_code} median={statistics.median(timings):7.1f}ms")
+
+db = SessionLocal()
+t = time.perf_counter()
+db.query(Analysis).order_by(Analysis.created_at.desc()).all()
+print(f"previous behaviour (load every row): {(time.perf_counter() - t) * 1000:.0f}ms")
+db.close()
@@ -0,0 +1,112 @@
+import os, sys, json, time, shutil, sqlite3, tempfile, statistics, asyncio
+from datetime import datetime, timedelta
+
+# Usage: python scripts/migrate_results.py [path/to/data.db]
+#        python scripts/migrate_results.py --seed 5000
+# Moves stored analyses to the compressed result layout, drops the old per-section columns and
+# reports database size and per-row read latency before and after. A real database is backed up
+# to <path>.bak first; --seed builds a throwaway database in the old layout instead.
+seed = None
+if len(sys.argv) > 2 and sys.argv[1] == "--seed":
+    seed = int(sys.argv[2])
+    db_path = os.path.join(tempfile.mkdtemp(), "legacy.db")
+else:
+    db_path = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else "data.db")
+    shutil.copy2(db_path, db_path + ".bak")
+    print(f"backup written to {db_path}.bak")
+os.environ["LEGALAI_DB_PATH"] = db_path
+sys.path.insert(0, os.getcwd())
+
+if seed:
+    from app.analysis import _mock_analysis
+    con = sqlite3.connect(db_path)
+    con.execute("""CREATE TABLE analyses (id INTEGER NOT NULL PRIMARY KEY, user_id INTEGER, filename VARCHAR(255) NOT NULL,
+        contract_type VARCHAR(255), risk_level VARCHAR(50), status VARCHAR(50), created_at DATETIME, updated_at DATETIME,
+        features VARCHAR(255), summary TEXT, classification TEXT, risk_assessment TEXT, missing_clauses TEXT,
+        experts_review TEXT, suggestions TEXT, json_result TEXT)""")
+    texts = ["consultant services commission california 24 months", "termination for convenience force majeure cpi",
+             "limitation of liability jams ownership of work product", "data privacy government public transport"]
+    start = datetime(2024, 1, 1)
+    batch = []
+    for i in range(seed):
+        r = _mock_analysis(texts[i % len(texts)] + f" {i}")
+        when = (start + timedelta(minutes=i)).isoformat(" ")
+        batch.append((f"contract_{i}.pdf", r["contract_type"], r["risk_level"], "Completed", when, when, "full", r["summary"],
+                      json.dumps(r["classification"]), json.dumps(r["risk"]), json.dumps(r["missing"]),
+                      json.dumps(r["experts"]), json.dumps(r["suggestions"]), json.dumps(r)))
+    con.executemany("INSERT INTO analyses (filename, contract_type, risk_level, status, created_at, updated_at, features, summary, "
+                    "classification, risk_assessment, missing_clauses, experts_review, suggestions, json_result) "
+                    "VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)", batch)
+    con.commit()
+    con.close()
+    print(f"seeded {seed} rows in the old layout")
+
+def db_size():
+    con = sqlite3.connect(db_path)
+    pages, page_size = con.execute("PRAGMA page_count").fetchone()[0], con.execute("PRAGMA page_size").fetchone()[0]
+    con.close()
+    return pages * page_size
+
+def time_reads(read_one, samples=500):
+    con = sqlite3.connect(db_path)
+    ids = [r[0] for r in con.execute("SELECT id FROM analyses ORDER BY RANDOM() LIMIT ?", (samples,))]
+    timings = []
+    for i in ids:
+        t = time.perf_counter()
+        read_one(con, i)
+        timings.append((time.perf_counter() - t) * 1000)
+    con.close()
+    return statistics.median(timings) if timings else 0.0
+
+def time_query(sql, runs=20):
+    con = sqlite3.connect(db_path)
+    timings = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        con.execute(sql).fetchall()
+        timings.append((time.perf_counter() - t) * 1000)
+    con.close()
+    return statistics.median(timings)
+
+def _loads(value):
+    try:
+        return json.loads(value) if value else None
+    except ValueError:
+        return None
+
+def read_legacy(con, analysis_id):
+    # What the results page used to do: load the whole row, then five json.loads over separate Text columns
+    row = con.execute("SELECT * FROM analyses WHERE id = ?", (analysis_id,)).fetchone()
+    return [_loads(x) for x in row[10:15]]
+
+def read_compressed(con, analysis_id):
+    # The legacy columns are still there when some rows could not be migrated, so look the blob up by name
+    cur = con.execute("SELECT * FROM analyses WHERE id = ?", (analysis_id,))
+    row = cur.fetchone()
+    return decode_result(row[[d[0] for d in cur.description].index("result_blob")])
+
+before_size = db_size()
+before_ms = time_reads(read_legacy)
+before_filter_ms = time_query("SELECT id FROM analyses WHERE json_valid(risk_assessment) "
+                              "AND CAST(json_extract(risk_assessment, '$.score') AS INTEGER) >= 70")
+
+from app.migrations import upgrade
+from app.models import decode_result
+t = time.perf_counter()
+# Dropping the legacy columns is safe here only because the database was backed up above
+stats = upgrade(drop_legacy=True)
+elapsed = time.perf_counter() - t
+con = sqlite3.connect(db_path)
+con.execute("VACUUM")
+con.close()
+print(f"migrated {stats['migrated_rows']} rows in {elapsed:.2f}s; added {stats['added_columns'] or 'no'} columns, "
+      f"dropped {stats['dropped_columns'] or 'no'} columns")
+if stats["unmigrated_rows"]:
+    print(f"{stats['unmigrated_rows']} rows could not be read and were left in the legacy columns, which were kept")
+
+after_size = db_size()
+after_ms = time_reads(read_compressed)
+after_filter_ms = time_query("SELECT id FROM analyses WHERE risk_score >= 70")
+print(f"database size: {before_size / 1e6:8.2f} MB -> {after_size / 1e6:8.2f} MB ({after_size / max(before_size, 1):.0%})")
+print(f"read one row:  {before_ms:8.3f} ms -> {after_ms:8.3f} ms (median)")
+print(f"score >= 70:   {before_filter_ms:8.3f} ms -> {after_filter_ms:8.3f} ms (median)")
@@ -0,0 +1,106 @@
+import httpx, os, sys, time, socket, tempfile, subprocess, threading, statistics
+
+# Usage: python scripts/test_concurrency.py [writers] [readers] [seconds] [uvicorn workers]
+# Starts the app with several worker processes on a throwaway SQLite database (or against
+# LEGALAI_DATABASE_URL if set) and hammers /analyze writes and /dashboard reads together.
+# Exits non-zero if any request errors or any accepted analysis fails to complete.
+writers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+readers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+duration = float(sys.argv[3]) if len(sys.argv) > 3 else 15
+workers = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+
+sock = socket.socket()
+sock.bind(("127.0.0.1", 0))
+port = sock.getsockname()[1]
+sock.close()
+base = f"http://127.0.0.1:{port}"
+
+env = dict(os.environ)
+env.setdefault("LEGALAI_DB_PATH", os.path.join(tempfile.mkdtemp(), "concurrency.db"))
+env.pop("OPENAI_API_KEY", None)
+server = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"], env=env)
+
+for _ in range(100):
+    try:
+        if httpx.get(base + "/dashboard").status_code == 200:
+            break
+    except httpx.TransportError:
+        pass
+    time.sleep(0.2)
+else:
+    server.terminate()
+    sys.exit("server did not start")
+
+sample = open(os.path.join(os.getcwd(), "sample.txt"), "rb").read()
+lock = threading.Lock()
+results = {"accepted": [], "rejected": 0, "errors": [], "read_ms": [], "write_ms": []}
+stop = time.time() + duration
+
+def writer(n):
+    with httpx.Client(base_url=base, timeout=60) as c:
+        i = 0
+        while time.time() < stop:
+            i += 1
+            # Unique bytes per upload so every request is a real insert, not a dedup hit
+            body = sample + f"\n{n}-{i}-{time.time()}".encode()
+            t = time.perf_counter()
+            try:
+                r = c.post("/analyze", files={"file": (f"doc-{n}-{i}.txt", body, "text/plain")}, data={"features": "full"}, headers={"Accept": "application/json"})
+            except httpx.HTTPError as e:
+                with lock:
+                    results["errors"].append(f"analyze: {e!r}")
+                continue
+            ms = (time.perf_counter() - t) * 1000
+            with lock:
+                results["write_ms"].append(ms)
+                if r.status_code == 202:
+                    results["accepted"].append(r.json()["analysis_id"])
+                elif r.status_code == 429:
+                    results["rejected"] += 1
+                else:
+                    results["errors"].append(f"analyze: HTTP {r.status_code}")
+
+def reader():
+    with httpx.Client(base_url=base, timeout=60) as c:
+        while time.time() < stop:
+            t = time.perf_counter()
+            try:
+                r = c.get("/dashboard")
+            except httpx.HTTPError as e:
+                with lock:
+                    results["errors"].append(f"dashboard: {e!r}")
+                continue
+            ms = (time.perf_counter() - t) * 1000
+            with lock:
+                results["read_ms"].append(ms)
+                if r.status_code != 200:
+                    results["errors"].append(f"dashboard: HTTP {r.status_code}")
+
+threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)] + [threading.Thread(target=reader) for _ in range(readers)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+
+# Wait for the queued analyses to drain, then check every one completed
+pending = list(results["accepted"])
+with httpx.Client(base_url=base, timeout=60) as c:
+    deadline = time.time() + 120
+    while pending and time.time() < deadline:
+        pending = [aid for aid in pending if c.get(f"/status/{aid}").json()["status"] not in ("Completed", "Failed")]
+        time.sleep(0.5)
+    failed = [aid for aid in results["accepted"] if c.get(f"/status/{aid}").json()["status"] != "Completed"]
+server.terminate()
+server.wait()
+
+def pct(xs, p):
+    return statistics.quantiles(xs, n=100)[p - 1] if len(xs) > 1 else (xs[0] if xs else 0.0)
+
+print(f"writes: {len(results['write_ms'])} ({len(results['accepted'])} accepted, {results['rejected']} rejected by backpressure) "
+      f"p50={pct(results['write_ms'], 50):.0f}ms p99={pct(results['write_ms'], 99):.0f}ms")
+print(f"reads:  {len(results['read_ms'])} p50={pct(results['read_ms'], 50):.0f}ms p99={pct(results['read_ms'], 99):.0f}ms")
+print(f"analyses not completed: {len(failed)}")
+print(f"errors: {len(results['errors'])}")
+for e in sorted(set(results["errors"]))[:10]:
+    print("  ", e)
+sys.exit(1 if results["errors"] or failed else 0)
@@ -11,6 +11,13 @@ print("Dashboard", s.get("/dashboard").status_code)
 with open(os.path.join(os.getcwd(),"sample.txt"), "rb") as f:
     r = s.post("/analyze", files={"file":("document.txt", f, "text/plain")}, data={"features":"full"})
 print("Analyze submit", r.status_code)
+aid = r.url.path.rsplit("/", 1)[-1]
+for _ in range(30):
+    st = s.get(f"/status/{aid}").json()
+    if st["status"] in ("Completed", "Failed"):
+        break
+    time.sleep(1)
+print("Status", st["status"], st["progress"])
 time.sleep(1)
 h = s.get("/history")
 print("History", h.status_code, "items listed:", "Analysis History" in h.text)
@@ -185,7 +185,8 @@ def main():
         clauses_file="data/clauses.json",
         collection_name="contract_clauses",
         persist_directory="./chroma_db",
-        embedding_model="all-MiniLM-L6-v2"
+        embedding_model="all-MiniLM-L6-v2",
+        embedding_cache_dir="./embedding_cache"
     )
     
     retriever = initializer.initialize_full_system(reset_db=False)
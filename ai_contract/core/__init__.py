@@ -3,7 +3,10 @@ Core modules for contract clause AI system.
 """
 
 from .embedder import ClauseEmbedder
-from .vector_db import VectorDatabase
+from .embedding_cache import EmbeddingCache
+from .vector_db import VectorDatabase, create_vector_database
+from .numpy_vector_db import NumpyVectorDatabase
+from .partitioned_vector_db import PartitionedVectorDatabase
 from .retriever import ClauseRetriever
 
-__all__ = ['ClauseEmbedder', 'VectorDatabase', 'ClauseRetriever']
\ No newline at end of file
+__all__ = ['ClauseEmbedder', 'EmbeddingCache', 'VectorDatabase', 'NumpyVectorDatabase', 'PartitionedVectorDatabase', 'create_vector_database', 'ClauseRetriever']
\ No newline at end of file
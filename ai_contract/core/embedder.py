@@ -2,24 +2,45 @@
 Embedder module for converting text to vector embeddings.
 """
 
-from typing import List
+from typing import List, Optional, Dict, Any
+import numpy as np
 from sentence_transformers import SentenceTransformer
+from .embedding_cache import EmbeddingCache
 
 
 class ClauseEmbedder:
     """Handles text embedding generation using sentence transformers."""
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_dir: Optional[str] = "./embedding_cache",
+        cache_memory_items: int = 10000,
+        use_cache: bool = True
+    ):
         """
         Initialize the embedder with a sentence transformer model.
         
         Args:
             model_name: Name of the sentence transformer model to use
+            cache_dir: Directory for the persistent embedding cache (None for memory only)
+            cache_memory_items: Maximum number of embeddings kept in the in-memory LRU
+            use_cache: Whether to cache embeddings at all
         """
         print(f"Loading embedding model: {model_name}")
+        self.model_name = model_name
         self.model = SentenceTransformer(model_name)
         self.embedding_dimension = self.model.get_sentence_embedding_dimension()
         print(f"Model loaded successfully. Embedding dimension: {self.embedding_dimension}")
+        
+        self.cache = None
+        if use_cache:
+            self.cache = EmbeddingCache(
+                model_name=model_name,
+                cache_dir=cache_dir,
+                max_memory_items=cache_memory_items
+            )
+            print(f"Embedding cache enabled at: {cache_dir or '(memory only)'}")
     
     def embed_text(self, text: str) -> List[float]:
         """
@@ -31,21 +52,50 @@ class ClauseEmbedder:
         Returns:
             List of floats representing the embedding vector
         """
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        return self.embed_texts([text], show_progress_bar=False)[0]
     
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+    def embed_texts(self, texts: List[str], show_progress_bar: bool = True) -> List[List[float]]:
         """
         Convert multiple text strings to embeddings.
         
+        Cached embeddings are reused; only texts missing from the cache are
+        sent to the model, in a single batched encode call.
+        
         Args:
             texts: List of input texts to embed
+            show_progress_bar: Whether to display the encoding progress bar
             
         Returns:
             List of embedding vectors
         """
-        embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=True)
-        return embeddings.tolist()
+        if not texts:
+            return []
+        
+        if self.cache is None:
+            embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=show_progress_bar)
+            return embeddings.tolist()
+        
+        vectors = self.cache.get_many(texts)
+        
+        # Deduplicate misses so repeated texts are encoded only once
+        missing = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(texts[i], []).append(i)
+        
+        if missing:
+            missing_texts = list(missing)
+            encoded = self.model.encode(
+                missing_texts,
+                convert_to_numpy=True,
+                show_progress_bar=show_progress_bar and len(missing_texts) > 1
+            ).astype(np.float32)
+            self.cache.put_many(missing_texts, list(encoded))
+            for text, vector in zip(missing_texts, encoded):
+                for i in missing[text]:
+                    vectors[i] = vector
+        
+        return np.vstack(vectors).tolist()
     
     def get_embedding_dimension(self) -> int:
         """
@@ -54,4 +104,15 @@ class ClauseEmbedder:
         Returns:
             Integer representing embedding dimension
         """
-        return self.embedding_dimension
\ No newline at end of file
+        return self.embedding_dimension
+    
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """
+        Get hit/miss statistics for the embedding cache.
+        
+        Returns:
+            Dictionary with cache statistics (empty if caching is disabled)
+        """
+        if self.cache is None:
+            return {}
+        return self.cache.get_statistics()
\ No newline at end of file
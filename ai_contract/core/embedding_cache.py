@@ -0,0 +1,185 @@
+"""
+Embedding cache module for reusing previously computed embeddings.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Content-addressed embedding cache with an in-memory LRU over an on-disk SQLite store."""
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: Optional[str] = "./embedding_cache",
+        max_memory_items: int = 10000
+    ):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            model_name: Name of the embedding model the cached vectors belong to
+            cache_dir: Directory for the on-disk store (None keeps the cache in memory only)
+            max_memory_items: Maximum number of embeddings kept in the in-memory LRU
+        """
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.max_memory_items = max_memory_items
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if cache_dir:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(Path(cache_dir) / "embeddings.sqlite3"),
+                check_same_thread=False
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    def make_key(self, text: str) -> str:
+        """
+        Build the cache key for a text under the current model.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Hex digest identifying the (model, text) pair
+        """
+        digest = hashlib.sha256()
+        digest.update(self.model_name.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up cached embeddings for a list of texts.
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            List aligned with texts holding the cached vector or None on a miss
+        """
+        keys = [self.make_key(text) for text in texts]
+        found: List[Optional[np.ndarray]] = [None] * len(texts)
+        disk_lookup: Dict[str, List[int]] = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[i] = vector
+                    self.memory_hits += 1
+                else:
+                    disk_lookup.setdefault(key, []).append(i)
+
+            if disk_lookup and self._conn is not None:
+                pending = list(disk_lookup)
+                # SQLite limits the number of bound parameters per statement
+                for start in range(0, len(pending), 500):
+                    chunk = pending[start:start + 500]
+                    placeholders = ",".join("?" for _ in chunk)
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        self._remember(key, vector)
+                        for i in disk_lookup.pop(key):
+                            found[i] = vector
+                            self.disk_hits += 1
+
+            for indices in disk_lookup.values():
+                self.misses += len(indices)
+
+        return found
+
+    def put_many(self, texts: List[str], vectors: List[np.ndarray]) -> None:
+        """
+        Store embeddings for a list of texts.
+
+        Args:
+            texts: List of input texts
+            vectors: Embedding vectors aligned with texts
+        """
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = self.make_key(text)
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((key, self.model_name, vector.tobytes()))
+
+            if rows and self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, model, vector) VALUES (?, ?, ?)",
+                    rows
+                )
+                self._conn.commit()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Insert a vector into the in-memory LRU, evicting the oldest entries."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached embedding for the current model."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embeddings WHERE model = ?", (self.model_name,))
+                self._conn.commit()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get hit/miss statistics for the cache.
+
+        Returns:
+            Dictionary with cache counters and sizes
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            disk_entries = 0
+            if self._conn is not None:
+                disk_entries = self._conn.execute(
+                    "SELECT COUNT(*) FROM embeddings WHERE model = ?", (self.model_name,)
+                ).fetchone()[0]
+
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries
+            }
+
+    def close(self) -> None:
+        """Close the on-disk store."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
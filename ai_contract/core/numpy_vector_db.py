@@ -0,0 +1,380 @@
+"""
+In-process vector database using a brute-force NumPy index.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from .vector_db import serialize_metadatas
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    """Build a one-dimensional object array without NumPy inferring nested shapes."""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+class NumpyVectorDatabase:
+    """
+    Brute-force vector index with the same interface as VectorDatabase.
+
+    Embeddings are L2-normalized and kept in one contiguous float32 matrix
+    that is memory-mapped from disk. Metadata is stored column-wise so
+    filters are evaluated as vectorized comparisons. Distances are squared
+    L2 distances between unit vectors, matching ChromaDB's default "l2" space.
+    """
+
+    def __init__(self, collection_name: str = "contract_clauses", persist_directory: Optional[str] = "./vector_index"):
+        """
+        Initialize the vector database.
+
+        Args:
+            collection_name: Name of the collection to create/use
+            persist_directory: Directory to persist the index (None keeps it in memory only)
+        """
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+
+        self._lock = threading.RLock()
+        self._dir = Path(persist_directory) / collection_name if persist_directory else None
+
+        self._embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._ids: List[str] = []
+        self._documents = np.empty(0, dtype=object)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._id_index: Dict[str, int] = {}
+
+        print(f"Initialized NumPy vector index at: {persist_directory or '(memory only)'}")
+
+        if self._dir is not None and (self._dir / "records.json").exists():
+            self._load()
+            print(f"Loaded existing collection: {collection_name}")
+        else:
+            print(f"Created new collection: {collection_name}")
+
+    def add_documents(
+        self,
+        ids: List[str],
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Add documents with their embeddings to the vector database.
+
+        Args:
+            ids: List of unique IDs for each document
+            documents: List of document texts
+            embeddings: List of embedding vectors
+            metadatas: Optional list of metadata dictionaries
+        """
+        with self._lock:
+            duplicates = [doc_id for doc_id in ids if doc_id in self._id_index]
+            if duplicates or len(set(ids)) != len(ids):
+                raise ValueError(f"Duplicate document IDs: {duplicates[:5] or 'within batch'}")
+            self._write(ids, documents, embeddings, metadatas)
+
+        print(f"Added {len(ids)} documents to the vector database")
+
+    def upsert_documents(
+        self,
+        ids: List[str],
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Insert new documents or overwrite existing ones with the same IDs.
+
+        Args:
+            ids: List of unique IDs for each document
+            documents: List of document texts
+            embeddings: List of embedding vectors
+            metadatas: Optional list of metadata dictionaries
+        """
+        if not ids:
+            return
+
+        with self._lock:
+            self._write(ids, documents, embeddings, metadatas)
+
+        print(f"Upserted {len(ids)} documents in the vector database")
+
+    def delete_documents(self, ids: List[str]) -> None:
+        """
+        Delete documents by ID.
+
+        Args:
+            ids: List of document IDs to delete
+        """
+        with self._lock:
+            rows = [self._id_index[doc_id] for doc_id in ids if doc_id in self._id_index]
+            if not rows:
+                return
+
+            keep = np.ones(len(self._ids), dtype=bool)
+            keep[rows] = False
+            self._embeddings = np.ascontiguousarray(self._embeddings[keep])
+            self._ids = [doc_id for doc_id, kept in zip(self._ids, keep) if kept]
+            self._documents = self._documents[keep]
+            self._columns = {key: column[keep] for key, column in self._columns.items()}
+            self._rebuild_id_index()
+            self._save()
+
+        print(f"Deleted {len(rows)} documents from the vector database")
+
+    def get_metadata_field(self, field: str) -> Dict[str, Any]:
+        """
+        Get a single metadata field for every document in the collection.
+
+        Args:
+            field: Metadata key to read
+
+        Returns:
+            Dictionary mapping document ID to the field value (None if absent)
+        """
+        with self._lock:
+            column = self._columns.get(field)
+            if column is None:
+                return {doc_id: None for doc_id in self._ids}
+            return dict(zip(self._ids, column.tolist()))
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Query the vector database for similar documents.
+
+        Args:
+            query_embeddings: List of query embedding vectors
+            n_results: Number of results to return
+            where: Optional metadata filter (equality, $eq, $ne, $in, $nin, $and, $or)
+
+        Returns:
+            Dictionary containing query results in ChromaDB's layout
+        """
+        with self._lock:
+            embeddings = self._embeddings
+            candidates = None
+            if where:
+                candidates = np.flatnonzero(self._evaluate_filter(where))
+                embeddings = embeddings[candidates]
+
+            results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+            k = min(n_results, embeddings.shape[0])
+            if k == 0:
+                for _ in query_embeddings:
+                    for key in results:
+                        results[key].append([])
+                return results
+
+            queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32))
+            scores = queries @ embeddings.T
+
+            if k < scores.shape[1]:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(scores.shape[1]), (scores.shape[0], scores.shape[1]))
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            for rows, row_scores in zip(top, top_scores):
+                if candidates is not None:
+                    rows = candidates[rows]
+                results["ids"].append([self._ids[row] for row in rows])
+                results["documents"].append(self._documents[rows].tolist())
+                results["metadatas"].append([self._row_metadata(row) for row in rows])
+                results["distances"].append(np.maximum(2.0 - 2.0 * row_scores, 0.0).tolist())
+
+            return results
+
+    def get_collection_count(self) -> int:
+        """
+        Get the number of documents in the collection.
+
+        Returns:
+            Integer count of documents
+        """
+        return len(self._ids)
+
+    def delete_collection(self) -> None:
+        """Delete the entire collection."""
+        with self._lock:
+            self._clear()
+            if self._dir is not None:
+                for name in ("embeddings.npy", "records.json"):
+                    path = self._dir / name
+                    if path.exists():
+                        path.unlink()
+        print(f"Deleted collection: {self.collection_name}")
+
+    def reset_collection(self) -> None:
+        """Reset the collection by deleting and recreating it."""
+        self.delete_collection()
+        print(f"Reset collection: {self.collection_name}")
+
+    def _write(
+        self,
+        ids: List[str],
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]]
+    ) -> None:
+        """Overwrite existing rows and append new ones, then persist the index."""
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        processed_metadatas = serialize_metadatas(ids, metadatas)
+
+        if self._embeddings.shape[0] == 0:
+            self._embeddings = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+        elif vectors.shape[1] != self._embeddings.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match index dimension {self._embeddings.shape[1]}"
+            )
+
+        existing = [(i, self._id_index[doc_id]) for i, doc_id in enumerate(ids) if doc_id in self._id_index]
+        new = [i for i, doc_id in enumerate(ids) if doc_id not in self._id_index]
+
+        # Copy out of the read-only memory map before mutating rows in place
+        matrix = np.vstack([self._embeddings, vectors[new]]) if new else np.array(self._embeddings)
+        documents_column = np.concatenate([self._documents, _object_array([documents[i] for i in new])])
+
+        keys = set(self._columns)
+        for metadata in processed_metadatas:
+            keys.update(metadata)
+        total = len(self._ids) + len(new)
+        columns = {}
+        for key in keys:
+            column = np.empty(total, dtype=object)
+            column[:len(self._ids)] = self._columns.get(key, np.empty(len(self._ids), dtype=object))
+            for offset, i in enumerate(new):
+                column[len(self._ids) + offset] = processed_metadatas[i].get(key)
+            columns[key] = column
+
+        for i, row in existing:
+            matrix[row] = vectors[i]
+            documents_column[row] = documents[i]
+            for key in keys:
+                columns[key][row] = processed_metadatas[i].get(key)
+
+        self._embeddings = np.ascontiguousarray(matrix)
+        self._ids = self._ids + [ids[i] for i in new]
+        self._documents = documents_column
+        self._columns = columns
+        self._rebuild_id_index()
+        self._save()
+
+    def _evaluate_filter(self, where: Dict[str, Any]) -> np.ndarray:
+        """Evaluate a ChromaDB-style where filter into a boolean row mask."""
+        mask = np.ones(len(self._ids), dtype=bool)
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._evaluate_filter(clause)
+            elif key == "$or":
+                any_mask = np.zeros(len(self._ids), dtype=bool)
+                for clause in condition:
+                    any_mask |= self._evaluate_filter(clause)
+                mask &= any_mask
+            else:
+                column = self._columns.get(key)
+                if column is None:
+                    column = np.full(len(self._ids), None, dtype=object)
+                mask &= self._evaluate_condition(column, condition)
+        return mask
+
+    @staticmethod
+    def _evaluate_condition(column: np.ndarray, condition: Any) -> np.ndarray:
+        """Evaluate a single field condition against a metadata column."""
+        if not isinstance(condition, dict):
+            return column == str(condition)
+
+        mask = np.ones(len(column), dtype=bool)
+        for operator, value in condition.items():
+            if operator == "$eq":
+                mask &= column == str(value)
+            elif operator == "$ne":
+                mask &= column != str(value)
+            elif operator == "$in":
+                mask &= np.isin(column, [str(v) for v in value])
+            elif operator == "$nin":
+                mask &= ~np.isin(column, [str(v) for v in value])
+            else:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+        return mask
+
+    def _row_metadata(self, row: int) -> Dict[str, Any]:
+        """Reassemble the metadata dictionary of a single row."""
+        metadata = {}
+        for key, column in self._columns.items():
+            value = column[row]
+            if value is not None:
+                metadata[key] = value
+        return metadata
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize row vectors."""
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32)
+
+    def _rebuild_id_index(self) -> None:
+        """Rebuild the ID to row lookup table."""
+        self._id_index = {doc_id: row for row, doc_id in enumerate(self._ids)}
+
+    def _clear(self) -> None:
+        """Drop every row from memory."""
+        self._embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._ids = []
+        self._documents = np.empty(0, dtype=object)
+        self._columns = {}
+        self._id_index = {}
+
+    def _save(self) -> None:
+        """Persist the index atomically and re-open the matrix as a memory map."""
+        if self._dir is None:
+            return
+
+        self._dir.mkdir(parents=True, exist_ok=True)
+        matrix_path = self._dir / "embeddings.npy"
+        records_path = self._dir / "records.json"
+
+        tmp_matrix = self._dir / "embeddings.tmp.npy"
+        np.save(tmp_matrix, self._embeddings)
+        os.replace(tmp_matrix, matrix_path)
+
+        records = {
+            "ids": self._ids,
+            "documents": self._documents.tolist(),
+            "columns": {key: column.tolist() for key, column in self._columns.items()}
+        }
+        tmp_records = self._dir / "records.tmp.json"
+        with open(tmp_records, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False)
+        os.replace(tmp_records, records_path)
+
+        self._embeddings = np.load(matrix_path, mmap_mode='r')
+
+    def _load(self) -> None:
+        """Load a persisted index, memory-mapping the embedding matrix."""
+        with open(self._dir / "records.json", 'r', encoding='utf-8') as f:
+            records = json.load(f)
+
+        self._ids = records["ids"]
+        self._documents = _object_array(records["documents"])
+        self._columns = {key: _object_array(values) for key, values in records["columns"].items()}
+        self._embeddings = np.load(self._dir / "embeddings.npy", mmap_mode='r')
+        self._rebuild_id_index()
@@ -0,0 +1,329 @@
+"""
+Partitioned vector database that keeps one sub-index per metadata value.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Callable
+
+
+class PartitionedVectorDatabase:
+    """
+    Vector database split into one partition per value of the partition fields.
+
+    Rows are routed to a partition at ingest time based on their metadata
+    (by default their contract_type). Queries that pin every partition field
+    with an equality filter go straight to a single partition; other queries
+    fan out to the matching partitions and the per-partition top-k lists are
+    merged by distance.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Any],
+        collection_name: str = "contract_clauses",
+        persist_directory: Optional[str] = "./chroma_db",
+        partition_by: Tuple[str, ...] = ("contract_type",)
+    ):
+        """
+        Initialize the partitioned vector database.
+
+        Args:
+            factory: Callable creating a backend database for a given collection name
+            collection_name: Base name of the collection; partitions derive their names from it
+            persist_directory: Directory where the partition manifest is stored (None for memory only)
+            partition_by: Metadata fields whose values define the partitions
+        """
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+        self.partition_by = tuple(partition_by)
+
+        self._factory = factory
+        self._lock = threading.RLock()
+        self._manifest_path = (
+            Path(persist_directory) / f"{collection_name}.partitions.json" if persist_directory else None
+        )
+
+        self._partitions: Dict[Tuple[str, ...], Any] = {}
+        self._id_partition: Dict[str, Tuple[str, ...]] = {}
+
+        for key, name in self._load_manifest():
+            partition = self._factory(name)
+            self._partitions[key] = partition
+            for doc_id in partition.get_metadata_field(self.partition_by[0]):
+                self._id_partition[doc_id] = key
+
+        print(f"Partitioned collection {collection_name} by {', '.join(self.partition_by)}: "
+              f"{len(self._partitions)} partitions")
+
+    def add_documents(
+        self,
+        ids: List[str],
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Add documents to the partitions matching their metadata.
+
+        Args:
+            ids: List of unique IDs for each document
+            documents: List of document texts
+            embeddings: List of embedding vectors
+            metadatas: Optional list of metadata dictionaries
+        """
+        self._write("add_documents", ids, documents, embeddings, metadatas)
+
+    def upsert_documents(
+        self,
+        ids: List[str],
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Insert or overwrite documents, moving them if their partition changed.
+
+        Args:
+            ids: List of unique IDs for each document
+            documents: List of document texts
+            embeddings: List of embedding vectors
+            metadatas: Optional list of metadata dictionaries
+        """
+        if not ids:
+            return
+        self._write("upsert_documents", ids, documents, embeddings, metadatas)
+
+    def delete_documents(self, ids: List[str]) -> None:
+        """
+        Delete documents by ID from whichever partition holds them.
+
+        Args:
+            ids: List of document IDs to delete
+        """
+        with self._lock:
+            grouped: Dict[Tuple[str, ...], List[str]] = {}
+            for doc_id in ids:
+                key = self._id_partition.pop(doc_id, None)
+                if key is not None:
+                    grouped.setdefault(key, []).append(doc_id)
+
+            for key, partition_ids in grouped.items():
+                self._partitions[key].delete_documents(partition_ids)
+
+    def get_metadata_field(self, field: str) -> Dict[str, Any]:
+        """
+        Get a single metadata field for every document across all partitions.
+
+        Args:
+            field: Metadata key to read
+
+        Returns:
+            Dictionary mapping document ID to the field value (None if absent)
+        """
+        values = {}
+        for partition in list(self._partitions.values()):
+            values.update(partition.get_metadata_field(field))
+        return values
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Query the partitions selected by the filter and merge their results.
+
+        Args:
+            query_embeddings: List of query embedding vectors
+            n_results: Number of results to return
+            where: Optional metadata filter
+
+        Returns:
+            Dictionary containing query results in ChromaDB's layout
+        """
+        pinned, residual = self._split_filter(where)
+        targets = [
+            partition for key, partition in list(self._partitions.items())
+            if all(key[i] == pinned[field] for i, field in enumerate(self.partition_by) if field in pinned)
+        ]
+
+        if len(targets) == 1:
+            return targets[0].query(query_embeddings=query_embeddings, n_results=n_results, where=residual)
+
+        merged = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        partial = [
+            partition.query(query_embeddings=query_embeddings, n_results=n_results, where=residual)
+            for partition in targets
+            if partition.get_collection_count() > 0
+        ]
+
+        for row in range(len(query_embeddings)):
+            candidates = []
+            for results in partial:
+                for i, doc_id in enumerate(results["ids"][row]):
+                    candidates.append((
+                        results["distances"][row][i],
+                        doc_id,
+                        results["documents"][row][i],
+                        results["metadatas"][row][i]
+                    ))
+            candidates.sort(key=lambda item: item[0])
+            candidates = candidates[:n_results]
+
+            merged["distances"].append([c[0] for c in candidates])
+            merged["ids"].append([c[1] for c in candidates])
+            merged["documents"].append([c[2] for c in candidates])
+            merged["metadatas"].append([c[3] for c in candidates])
+
+        return merged
+
+    def get_collection_count(self) -> int:
+        """
+        Get the number of documents across all partitions.
+
+        Returns:
+            Integer count of documents
+        """
+        return sum(partition.get_collection_count() for partition in list(self._partitions.values()))
+
+    def get_partition_counts(self) -> Dict[str, int]:
+        """
+        Get the number of documents in each partition.
+
+        Returns:
+            Dictionary mapping the partition label to its document count
+        """
+        return {
+            "/".join(key): partition.get_collection_count()
+            for key, partition in list(self._partitions.items())
+        }
+
+    def delete_collection(self) -> None:
+        """Delete every partition and the partition manifest."""
+        with self._lock:
+            for partition in self._partitions.values():
+                partition.delete_collection()
+            self._partitions = {}
+            self._id_partition = {}
+            if self._manifest_path is not None and self._manifest_path.exists():
+                self._manifest_path.unlink()
+        print(f"Deleted collection: {self.collection_name}")
+
+    def reset_collection(self) -> None:
+        """Reset the collection by dropping every partition."""
+        self.delete_collection()
+        print(f"Reset collection: {self.collection_name}")
+
+    def _write(
+        self,
+        method: str,
+        ids: List[str],
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]]
+    ) -> None:
+        """Group rows by partition and forward them to the partition backends."""
+        if metadatas is None:
+            metadatas = [{} for _ in ids]
+
+        with self._lock:
+            grouped: Dict[Tuple[str, ...], List[int]] = {}
+            moved: Dict[Tuple[str, ...], List[str]] = {}
+            for i, metadata in enumerate(metadatas):
+                key = tuple(str(metadata.get(field, "")) for field in self.partition_by)
+                grouped.setdefault(key, []).append(i)
+
+                previous = self._id_partition.get(ids[i])
+                if previous is not None and previous != key:
+                    moved.setdefault(previous, []).append(ids[i])
+
+            for key, stale_ids in moved.items():
+                self._partitions[key].delete_documents(stale_ids)
+
+            for key, rows in grouped.items():
+                partition = self._get_or_create_partition(key)
+                getattr(partition, method)(
+                    ids=[ids[i] for i in rows],
+                    documents=[documents[i] for i in rows],
+                    embeddings=[embeddings[i] for i in rows],
+                    metadatas=[metadatas[i] for i in rows]
+                )
+                for i in rows:
+                    self._id_partition[ids[i]] = key
+
+    def _get_or_create_partition(self, key: Tuple[str, ...]):
+        """Return the partition for a key, creating and registering it if needed."""
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = self._factory(self._partition_name(key))
+            self._partitions[key] = partition
+            self._save_manifest()
+        return partition
+
+    def _partition_name(self, key: Tuple[str, ...]) -> str:
+        """Derive a backend-safe collection name for a partition key."""
+        digest = hashlib.sha1("\x1f".join(key).encode("utf-8")).hexdigest()[:12]
+        return f"{self.collection_name}-p-{digest}"
+
+    def _split_filter(self, where: Optional[Dict[str, Any]]) -> Tuple[Dict[str, str], Optional[Dict[str, Any]]]:
+        """
+        Split a where filter into pinned partition values and the residual filter.
+
+        Args:
+            where: Optional metadata filter
+
+        Returns:
+            Tuple of (pinned partition field values, residual filter or None)
+        """
+        if not where:
+            return {}, None
+
+        conditions = list(where["$and"]) if set(where) == {"$and"} else [{k: v} for k, v in where.items()]
+
+        pinned = {}
+        residual = []
+        for condition in conditions:
+            if len(condition) == 1:
+                field, value = next(iter(condition.items()))
+                if isinstance(value, dict) and set(value) == {"$eq"}:
+                    value = value["$eq"]
+                if field in self.partition_by and not isinstance(value, dict):
+                    pinned[field] = str(value)
+                    continue
+            residual.append(condition)
+
+        if not residual:
+            return pinned, None
+        if len(residual) == 1:
+            return pinned, residual[0]
+        return pinned, {"$and": residual}
+
+    def _load_manifest(self) -> List[Tuple[Tuple[str, ...], str]]:
+        """Read the persisted list of partitions."""
+        if self._manifest_path is None or not self._manifest_path.exists():
+            return []
+        with open(self._manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if tuple(manifest.get("partition_by", [])) != self.partition_by:
+            print(f"Partition fields changed; ignoring existing manifest {self._manifest_path}")
+            return []
+        return [(tuple(entry["key"]), entry["collection"]) for entry in manifest.get("partitions", [])]
+
+    def _save_manifest(self) -> None:
+        """Persist the list of partitions."""
+        if self._manifest_path is None:
+            return
+        self._manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "partition_by": list(self.partition_by),
+            "partitions": [
+                {"key": list(key), "collection": self._partition_name(key)}
+                for key in self._partitions
+            ]
+        }
+        with open(self._manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
@@ -2,7 +2,7 @@
 Retriever module for similarity-based clause retrieval.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union, Tuple
 from .embedder import ClauseEmbedder
 from .vector_db import VectorDatabase
 
@@ -47,19 +47,13 @@ class ClauseRetriever:
         query_embedding = self.embedder.embed_text(query)
         
         # Build metadata filter
-        where_filter = {}
-        if contract_type:
-            where_filter["contract_type"] = contract_type
-        if category:
-            where_filter["category"] = category
-        if risk_level:
-            where_filter["risk_level"] = risk_level
+        where_filter = self._build_where_filter(contract_type, category, risk_level)
         
         # Perform similarity search
         results = self.vector_db.query(
             query_embeddings=[query_embedding],
             n_results=top_k,
-            where=where_filter if where_filter else None
+            where=where_filter
         )
         
         # Format results
@@ -67,6 +61,54 @@ class ClauseRetriever:
         
         return formatted_results
     
+    def retrieve_many(
+        self,
+        queries: List[Union[str, Dict[str, Any]]],
+        top_k: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve clauses for many queries at once.
+        
+        All query texts are embedded in one batched call, and queries that
+        share the same metadata filter are sent to the vector database
+        together in a single query call.
+        
+        Args:
+            queries: List of query strings, or dictionaries with a "query" key and
+                     optional "contract_type", "category", "risk_level" and "top_k" keys
+            top_k: Default number of results for queries that do not set "top_k"
+            
+        Returns:
+            List of result lists, one per query, in input order
+        """
+        specs = [{"query": q} if isinstance(q, str) else q for q in queries]
+        if not specs:
+            return []
+        
+        query_embeddings = self.embedder.embed_texts(
+            [spec["query"] for spec in specs],
+            show_progress_bar=False
+        )
+        
+        # Group query positions by filter so each group is one DB call
+        groups: Dict[Tuple, List[int]] = {}
+        for i, spec in enumerate(specs):
+            key = (spec.get("contract_type") or None, spec.get("category") or None, spec.get("risk_level") or None)
+            groups.setdefault(key, []).append(i)
+        
+        all_results: List[List[Dict[str, Any]]] = [[] for _ in specs]
+        for (contract_type, category, risk_level), positions in groups.items():
+            limits = [specs[i].get("top_k") or top_k for i in positions]
+            results = self.vector_db.query(
+                query_embeddings=[query_embeddings[i] for i in positions],
+                n_results=max(limits),
+                where=self._build_where_filter(contract_type, category, risk_level)
+            )
+            for row, (i, limit) in enumerate(zip(positions, limits)):
+                all_results[i] = self._format_results(results, query_index=row)[:limit]
+        
+        return all_results
+    
     def retrieve_by_contract_type(
         self,
         query: str,
@@ -90,12 +132,45 @@ class ClauseRetriever:
             top_k=top_k
         )
     
-    def _format_results(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _build_where_filter(
+        contract_type: Optional[str] = None,
+        category: Optional[str] = None,
+        risk_level: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build a ChromaDB metadata filter from the optional filter values.
+        
+        Args:
+            contract_type: Optional filter for specific contract type
+            category: Optional filter for clause category
+            risk_level: Optional filter for risk level
+            
+        Returns:
+            Where filter dictionary, or None if no filters are set
+        """
+        conditions = []
+        if contract_type:
+            conditions.append({"contract_type": contract_type})
+        if category:
+            conditions.append({"category": category})
+        if risk_level:
+            conditions.append({"risk_level": risk_level})
+        
+        if not conditions:
+            return None
+        if len(conditions) == 1:
+            return conditions[0]
+        # ChromaDB requires an explicit operator to combine several conditions
+        return {"$and": conditions}
+    
+    def _format_results(self, results: Dict[str, Any], query_index: int = 0) -> List[Dict[str, Any]]:
         """
         Format raw ChromaDB results into structured output.
         
         Args:
             results: Raw results from ChromaDB query
+            query_index: Which query's results to format when several were batched
             
         Returns:
             List of formatted result dictionaries
@@ -105,10 +180,10 @@ class ClauseRetriever:
         if not results or not results.get('ids'):
             return formatted
         
-        ids = results['ids'][0] if results['ids'] else []
-        documents = results['documents'][0] if results['documents'] else []
-        metadatas = results['metadatas'][0] if results['metadatas'] else []
-        distances = results['distances'][0] if results['distances'] else []
+        ids = results['ids'][query_index] if results['ids'] else []
+        documents = results['documents'][query_index] if results['documents'] else []
+        metadatas = results['metadatas'][query_index] if results['metadatas'] else []
+        distances = results['distances'][query_index] if results['distances'] else []
         
         for i in range(len(ids)):
             similarity_score = 1 - distances[i] if distances else 0
@@ -132,8 +207,14 @@ class ClauseRetriever:
         """
         total_count = self.vector_db.get_collection_count()
         
+        partitions = {}
+        if hasattr(self.vector_db, "get_partition_counts"):
+            partitions = self.vector_db.get_partition_counts()
+        
         return {
             "total_clauses": total_count,
             "collection_name": self.vector_db.collection_name,
-            "embedding_dimension": self.embedder.get_embedding_dimension()
+            "embedding_dimension": self.embedder.get_embedding_dimension(),
+            "embedding_cache": self.embedder.get_cache_statistics(),
+            "partitions": partitions
         }
\ No newline at end of file
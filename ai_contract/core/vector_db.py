@@ -2,25 +2,115 @@
 Vector Database module using ChromaDB for storing and querying embeddings.
 """
 
-from typing import List, Dict, Any, Optional
-import chromadb
-from chromadb.config import Settings
+from typing import List, Dict, Any, Optional, Sequence
 import json
 
 
+def serialize_metadatas(
+    ids: List[str],
+    metadatas: Optional[List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    Convert metadata values to the scalar string values stored by the backends.
+    
+    Args:
+        ids: List of document IDs the metadatas belong to
+        metadatas: Optional list of metadata dictionaries
+        
+    Returns:
+        List of metadata dictionaries with string values
+    """
+    if metadatas is None:
+        metadatas = [{} for _ in ids]
+    
+    processed_metadatas = []
+    for metadata in metadatas:
+        processed_metadata = {}
+        for key, value in metadata.items():
+            if isinstance(value, (dict, list)):
+                processed_metadata[key] = json.dumps(value)
+            else:
+                processed_metadata[key] = str(value)
+        processed_metadatas.append(processed_metadata)
+    
+    return processed_metadatas
+
+
+def create_vector_database(
+    backend: str = "chroma",
+    collection_name: str = "contract_clauses",
+    persist_directory: Optional[str] = None,
+    partition_by: Optional[Sequence[str]] = None,
+    **kwargs
+):
+    """
+    Create a vector database for the requested backend.
+    
+    Args:
+        backend: "chroma" for ChromaDB or "numpy" for the in-process brute-force index
+        collection_name: Name of the collection to create/use
+        persist_directory: Directory to persist the database (backend default if None)
+        partition_by: Metadata fields to keep one sub-index per distinct value of, e.g. ["contract_type"]
+            (default: None, a single index; ClauseSystemInitializer passes its own partition_by through)
+        **kwargs: Extra backend-specific options
+        
+    Returns:
+        VectorDatabase, NumpyVectorDatabase or PartitionedVectorDatabase instance
+    """
+    if partition_by:
+        from .partitioned_vector_db import PartitionedVectorDatabase
+        return PartitionedVectorDatabase(
+            factory=lambda name: create_vector_database(
+                backend=backend,
+                collection_name=name,
+                persist_directory=persist_directory,
+                **kwargs
+            ),
+            collection_name=collection_name,
+            persist_directory=persist_directory or ("./chroma_db" if backend == "chroma" else "./vector_index"),
+            partition_by=tuple(partition_by)
+        )
+    
+    if backend == "chroma":
+        return VectorDatabase(
+            collection_name=collection_name,
+            persist_directory=persist_directory or "./chroma_db",
+            **kwargs
+        )
+    if backend == "numpy":
+        from .numpy_vector_db import NumpyVectorDatabase
+        return NumpyVectorDatabase(
+            collection_name=collection_name,
+            persist_directory=persist_directory or "./vector_index",
+            **kwargs
+        )
+    raise ValueError(f"Unknown vector database backend: {backend}")
+
+
 class VectorDatabase:
     """Vector database wrapper using ChromaDB for similarity search."""
     
-    def __init__(self, collection_name: str = "contract_clauses", persist_directory: str = "./chroma_db"):
+    def __init__(
+        self,
+        collection_name: str = "contract_clauses",
+        persist_directory: str = "./chroma_db",
+        batch_size: int = 5000
+    ):
         """
         Initialize the vector database.
         
         Args:
             collection_name: Name of the collection to create/use
             persist_directory: Directory to persist the database
+            batch_size: Maximum number of documents sent to ChromaDB per write call
         """
         self.collection_name = collection_name
         self.persist_directory = persist_directory
+        self.batch_size = batch_size
+        
+        # Imported lazily so the NumPy backend does not pay ChromaDB's import cost
+        import chromadb
+        from chromadb.config import Settings
         
         self.client = chromadb.Client(Settings(
             persist_directory=persist_directory,
@@ -55,28 +145,82 @@ class VectorDatabase:
             embeddings: List of embedding vectors
             metadatas: Optional list of metadata dictionaries
         """
-        if metadatas is None:
-            metadatas = [{} for _ in ids]
-        
-        processed_metadatas = []
-        for metadata in metadatas:
-            processed_metadata = {}
-            for key, value in metadata.items():
-                if isinstance(value, (dict, list)):
-                    processed_metadata[key] = json.dumps(value)
-                else:
-                    processed_metadata[key] = str(value)
-            processed_metadatas.append(processed_metadata)
-        
-        self.collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=processed_metadatas
-        )
+        processed_metadatas = serialize_metadatas(ids, metadatas)
+        
+        for start in range(0, len(ids), self.batch_size):
+            end = start + self.batch_size
+            self.collection.add(
+                ids=ids[start:end],
+                embeddings=embeddings[start:end],
+                documents=documents[start:end],
+                metadatas=processed_metadatas[start:end]
+            )
         
         print(f"Added {len(ids)} documents to the vector database")
     
+    def upsert_documents(
+        self,
+        ids: List[str],
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Insert new documents or overwrite existing ones with the same IDs.
+        
+        Args:
+            ids: List of unique IDs for each document
+            documents: List of document texts
+            embeddings: List of embedding vectors
+            metadatas: Optional list of metadata dictionaries
+        """
+        if not ids:
+            return
+        
+        processed_metadatas = serialize_metadatas(ids, metadatas)
+        
+        for start in range(0, len(ids), self.batch_size):
+            end = start + self.batch_size
+            self.collection.upsert(
+                ids=ids[start:end],
+                embeddings=embeddings[start:end],
+                documents=documents[start:end],
+                metadatas=processed_metadatas[start:end]
+            )
+        
+        print(f"Upserted {len(ids)} documents in the vector database")
+    
+    def delete_documents(self, ids: List[str]) -> None:
+        """
+        Delete documents by ID.
+        
+        Args:
+            ids: List of document IDs to delete
+        """
+        if not ids:
+            return
+        
+        for start in range(0, len(ids), self.batch_size):
+            self.collection.delete(ids=ids[start:start + self.batch_size])
+        
+        print(f"Deleted {len(ids)} documents from the vector database")
+    
+    def get_metadata_field(self, field: str) -> Dict[str, Any]:
+        """
+        Get a single metadata field for every document in the collection.
+        
+        Args:
+            field: Metadata key to read
+            
+        Returns:
+            Dictionary mapping document ID to the field value (None if absent)
+        """
+        records = self.collection.get(include=["metadatas"])
+        values = {}
+        for doc_id, metadata in zip(records.get('ids', []), records.get('metadatas') or []):
+            values[doc_id] = (metadata or {}).get(field)
+        return values
+    
     def query(
         self,
         query_embeddings: List[List[float]],
@@ -0,0 +1,221 @@
+"""
+Parity check and latency benchmark for the ChromaDB and NumPy vector backends.
+
+Run from the ai_contract directory:
+    python scripts/benchmark_vector_backends.py --size 20000 --queries 200
+
+Exits non-zero if the backends disagree: exact queries that do not find
+themselves, distances, documents or metadata that differ from the indexed
+data, results that break a where filter or differ from brute force when
+the filter leaves no more than top-k rows, or (with --min-recall) ChromaDB
+recall below the given value.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.vector_db import create_vector_database, serialize_metadatas
+
+
+CONTRACT_TYPES = ["NDA", "SLA", "Employment", "MSA", "Lease", "License"]
+CATEGORIES = ["confidentiality", "term", "liability", "payment", "termination", "ip"]
+RISK_LEVELS = ["low", "medium", "high"]
+
+
+def build_corpus(size: int, dimension: int, seed: int):
+    """Generate random unit vectors with clause-like metadata."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((size, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    ids = [f"CL-{i:06d}" for i in range(size)]
+    documents = [f"Synthetic clause {i}" for i in range(size)]
+    metadatas = [
+        {
+            "contract_type": CONTRACT_TYPES[i % len(CONTRACT_TYPES)],
+            "category": CATEGORIES[(i // 7) % len(CATEGORIES)],
+            "risk_level": RISK_LEVELS[(i // 3) % len(RISK_LEVELS)],
+            "version": i % 4,
+            "number": i,
+        }
+        for i in range(size)
+    ]
+    return ids, documents, vectors, metadatas
+
+
+def matches(metadata, where) -> bool:
+    """Reference evaluation of a where filter on one serialized metadata dictionary."""
+    for key, condition in (where or {}).items():
+        if key == "$and":
+            ok = all(matches(metadata, clause) for clause in condition)
+        elif key == "$or":
+            ok = any(matches(metadata, clause) for clause in condition)
+        else:
+            value = metadata.get(key)
+            ok = True
+            for operator, arg in (condition if isinstance(condition, dict) else {"$eq": condition}).items():
+                if operator == "$eq":
+                    ok &= value == str(arg)
+                elif operator == "$ne":
+                    ok &= value != str(arg)
+                elif operator == "$in":
+                    ok &= value in [str(v) for v in arg]
+                elif operator == "$nin":
+                    ok &= value not in [str(v) for v in arg]
+                else:
+                    raise ValueError(f"Unsupported filter operator: {operator}")
+        if not ok:
+            return False
+    return True
+
+
+def check_parity(backends, ids, documents, vectors, metadatas, queries, top_k, filters, tolerance, min_recall):
+    """
+    Compare every backend against brute-force ground truth.
+
+    Returns:
+        List of failure messages (empty when the backends agree)
+    """
+    failures = []
+    stored = serialize_metadatas(ids, metadatas)
+    row_of = {doc_id: row for row, doc_id in enumerate(ids)}
+
+    # Exact queries: an indexed vector must come back first, at distance zero
+    for name, db in backends.items():
+        for row in range(0, len(ids), max(1, len(ids) // max(1, len(queries)))):
+            results = db.query(query_embeddings=[vectors[row].tolist()], n_results=top_k)
+            got_id, got_distance = results["ids"][0][0], results["distances"][0][0]
+            if got_id != ids[row] or abs(got_distance) > tolerance:
+                failures.append(f"{name}: exact query for {ids[row]} returned {got_id} at distance {got_distance:.6f}")
+                break
+
+    for label, where in filters.items():
+        allowed = np.array([matches(m, where) for m in stored])
+        recall = {name: [] for name in backends}
+        for query in queries:
+            distances = np.sum((vectors - query) ** 2, axis=1)
+            candidates = np.flatnonzero(allowed)
+            expected = [ids[row] for row in candidates[np.argsort(distances[candidates], kind="stable")[:top_k]]]
+
+            for name, db in backends.items():
+                results = db.query(query_embeddings=[query.tolist()], n_results=top_k, where=where)
+                got = results["ids"][0]
+                if len(got) != len(expected):
+                    failures.append(f"{name} [{label}]: {len(got)} results, expected {len(expected)}")
+                for doc_id, document, metadata, distance in zip(
+                    got, results["documents"][0], results["metadatas"][0], results["distances"][0]
+                ):
+                    row = row_of[doc_id]
+                    if not allowed[row]:
+                        failures.append(f"{name} [{label}]: {doc_id} does not match the filter {where}")
+                    if abs(distance - distances[row]) > tolerance:
+                        failures.append(f"{name} [{label}]: distance of {doc_id} is {distance:.6f}, expected {distances[row]:.6f}")
+                    if document != documents[row] or metadata != stored[row]:
+                        failures.append(f"{name} [{label}]: document or metadata of {doc_id} differs: {metadata}")
+                # The NumPy index is exact, and so must every backend be when the filter leaves no more than top_k rows
+                if (name == "numpy" or allowed.sum() <= top_k) and got != expected:
+                    failures.append(f"{name} [{label}]: returned {got}, expected {expected}")
+                recall[name].append(len(set(got) & set(expected)) / len(expected) if expected else float(not got))
+
+        for name, values in recall.items():
+            if np.mean(values) < min_recall:
+                failures.append(f"{name} [{label}]: recall@{top_k} {np.mean(values):.3f} is below {min_recall}")
+    return failures
+
+
+def time_queries(db, queries, top_k, where):
+    """Run each query individually and return latencies in milliseconds plus the result IDs."""
+    latencies = []
+    result_ids = []
+    for query in queries:
+        start = time.perf_counter()
+        results = db.query(query_embeddings=[query.tolist()], n_results=top_k, where=where)
+        latencies.append((time.perf_counter() - start) * 1000)
+        result_ids.append(results["ids"][0])
+    return np.array(latencies), result_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=20000, help="Number of indexed vectors")
+    parser.add_argument("--dimension", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Number of timed queries")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--parity-queries", type=int, default=50, help="Queries compared against ground truth")
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="Allowed difference between distances")
+    # HNSW recall on random vectors is low at ChromaDB's default settings, so this is off unless asked for
+    parser.add_argument("--min-recall", type=float, default=0.0, help="Lowest acceptable recall@k for every backend")
+    args = parser.parse_args()
+
+    ids, documents, vectors, metadatas = build_corpus(args.size, args.dimension, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    queries = rng.standard_normal((args.queries, args.dimension)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    filters = {
+        "unfiltered": None,
+        "contract_type": {"contract_type": "NDA"},
+        "type+risk": {"$and": [{"contract_type": "SLA"}, {"risk_level": "high"}]},
+        "in/ne": {"$and": [{"category": {"$in": ["term", "ip"]}}, {"risk_level": {"$ne": "low"}}]},
+        "or": {"$or": [{"contract_type": "Lease"}, {"version": "3"}]},
+        "few matches": {"number": {"$in": ["0", "1", "2"]}},
+        "no match": {"contract_type": "Unknown"},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        backends = {}
+        for name in ("chroma", "numpy"):
+            start = time.perf_counter()
+            db = create_vector_database(
+                backend=name,
+                collection_name="benchmark",
+                persist_directory=str(Path(workdir) / name)
+            )
+            db.add_documents(ids=ids, documents=documents, embeddings=vectors.tolist(), metadatas=metadatas)
+            print(f"{name}: built index of {db.get_collection_count()} vectors in {time.perf_counter() - start:.2f}s")
+            backends[name] = db
+
+        failures = check_parity(
+            backends, ids, documents, vectors, metadatas, queries[:args.parity_queries],
+            args.top_k, filters, args.tolerance, args.min_recall
+        )
+        print()
+        if failures:
+            print(f"PARITY FAILED ({len(failures)} mismatches):")
+            for failure in failures[:20]:
+                print(f"  {failure}")
+        else:
+            print(f"parity: ok ({min(args.parity_queries, args.queries)} queries x {len(filters)} filters)")
+
+        print()
+        print(f"{'filter':<15}{'backend':<10}{'p50 ms':>10}{'p99 ms':>10}{'recall@k':>12}")
+        print("-" * 57)
+        for label, where in filters.items():
+            timings = {name: time_queries(db, queries, args.top_k, where) for name, db in backends.items()}
+
+            # The NumPy index is exact, so it is the reference for recall
+            exact = timings["numpy"][1]
+            for name, (latencies, result_ids) in timings.items():
+                overlap = [
+                    len(set(got) & set(expected)) / len(expected) if expected else float(not got)
+                    for got, expected in zip(result_ids, exact)
+                ]
+                print(
+                    f"{label:<15}{name:<10}{np.percentile(latencies, 50):>10.3f}"
+                    f"{np.percentile(latencies, 99):>10.3f}{np.mean(overlap):>12.3f}"
+                )
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
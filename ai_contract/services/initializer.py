@@ -3,10 +3,11 @@ Initializer module for loading clause data and initializing the vector database.
 """
 
 import json
-from typing import List, Dict, Any
+import hashlib
+from typing import List, Dict, Any, Optional, Sequence
 from pathlib import Path
 from core.embedder import ClauseEmbedder
-from core.vector_db import VectorDatabase
+from core.vector_db import VectorDatabase, create_vector_database
 from core.retriever import ClauseRetriever
 
 
@@ -17,8 +18,12 @@ class ClauseSystemInitializer:
         self,
         clauses_file: str = "data/clauses.json",
         collection_name: str = "contract_clauses",
-        persist_directory: str = "./chroma_db",
-        embedding_model: str = "all-MiniLM-L6-v2"
+        persist_directory: Optional[str] = None,
+        embedding_model: str = "all-MiniLM-L6-v2",
+        embedding_cache_dir: Optional[str] = "./embedding_cache",
+        use_embedding_cache: bool = True,
+        vector_backend: str = "chroma",
+        partition_by: Optional[Sequence[str]] = None
     ):
         """
         Initialize the system components.
@@ -26,18 +31,32 @@ class ClauseSystemInitializer:
         Args:
             clauses_file: Path to the clauses JSON file
             collection_name: Name for the vector database collection
-            persist_directory: Directory to persist the vector database
+            persist_directory: Directory to persist the vector database (None uses the backend's
+                               own default, ./chroma_db for chroma and ./vector_index for numpy)
             embedding_model: Name of the embedding model to use
+            embedding_cache_dir: Directory for the persistent embedding cache (None keeps it in memory only)
+            use_embedding_cache: Whether to cache embeddings at all
+            vector_backend: Vector database backend, "chroma" or "numpy"
+            partition_by: Metadata fields to partition the index by, e.g. ("contract_type",)
+                          (None for a single index). Switching an existing deployment to
+                          partitions ingests into new per-partition collections and leaves
+                          the single collection untouched.
         """
         self.clauses_file = clauses_file
         self.collection_name = collection_name
         self.persist_directory = persist_directory
         self.embedding_model = embedding_model
+        self.embedding_cache_dir = embedding_cache_dir
+        self.use_embedding_cache = use_embedding_cache
+        self.vector_backend = vector_backend
+        self.partition_by = partition_by
         
         self.embedder = None
         self.vector_db = None
         self.retriever = None
         self.clauses_data = []
+        self.clauses_loaded = False
+        self.sync_counts = {}
     
     def load_clauses(self) -> List[Dict[str, Any]]:
         """
@@ -57,6 +76,7 @@ class ClauseSystemInitializer:
         
         with open(clauses_path, 'r', encoding='utf-8') as f:
             self.clauses_data = json.load(f)
+        self.clauses_loaded = True
         
         print(f"✓ Loaded {len(self.clauses_data)} clauses")
         
@@ -82,7 +102,11 @@ class ClauseSystemInitializer:
         print(f"Initializing Embedder")
         print(f"{'='*60}")
         
-        self.embedder = ClauseEmbedder(model_name=self.embedding_model)
+        self.embedder = ClauseEmbedder(
+            model_name=self.embedding_model,
+            cache_dir=self.embedding_cache_dir,
+            use_cache=self.use_embedding_cache
+        )
         return self.embedder
     
     def initialize_vector_db(self, reset: bool = False) -> VectorDatabase:
@@ -99,9 +123,11 @@ class ClauseSystemInitializer:
         print(f"Initializing Vector Database")
         print(f"{'='*60}")
         
-        self.vector_db = VectorDatabase(
+        self.vector_db = create_vector_database(
+            backend=self.vector_backend,
             collection_name=self.collection_name,
-            persist_directory=self.persist_directory
+            persist_directory=self.persist_directory,
+            partition_by=self.partition_by
         )
         
         if reset:
@@ -112,7 +138,7 @@ class ClauseSystemInitializer:
     
     def ingest_clauses(self) -> None:
         """Ingest clauses into the vector database with embeddings."""
-        if not self.clauses_data:
+        if not self.clauses_loaded:
             raise ValueError("No clauses loaded. Call load_clauses() first.")
         
         if not self.embedder:
@@ -125,11 +151,103 @@ class ClauseSystemInitializer:
         print(f"Ingesting Clauses into Vector Database")
         print(f"{'='*60}")
         
+        if not self.clauses_data:
+            print("Clauses file is empty. Nothing to ingest.")
+            return
+        
+        ids, documents, metadatas = self._build_records(self.clauses_data)
+        
+        print(f"Generating embeddings for {len(documents)} documents...")
+        embeddings = self.embedder.embed_texts(documents)
+        
+        print(f"Adding documents to vector database...")
+        self.vector_db.add_documents(
+            ids=ids,
+            documents=documents,
+            embeddings=embeddings,
+            metadatas=metadatas
+        )
+        
+        print(f"✓ Successfully ingested {len(ids)} clauses")
+        print(f"✓ Vector database now contains {self.vector_db.get_collection_count()} documents")
+    
+    def sync_clauses(self) -> Dict[str, int]:
+        """
+        Incrementally synchronize the vector database with the clauses file.
+        
+        Each clause is fingerprinted by a content hash of its title, text and
+        metadata. Only new or changed clauses are embedded and upserted, and
+        clauses no longer present in the file are deleted. An empty clauses
+        file is a valid target state and removes every stored clause.
+        
+        Returns:
+            Dictionary with added/updated/deleted/unchanged counts
+        """
+        if not self.clauses_loaded:
+            raise ValueError("No clauses loaded. Call load_clauses() first.")
+        
+        if not self.embedder:
+            raise ValueError("Embedder not initialized. Call initialize_embedder() first.")
+        
+        if not self.vector_db:
+            raise ValueError("Vector DB not initialized. Call initialize_vector_db() first.")
+        
+        print(f"\n{'='*60}")
+        print(f"Synchronizing Clauses with Vector Database")
+        print(f"{'='*60}")
+        
+        ids, documents, metadatas = self._build_records(self.clauses_data)
+        stored_hashes = self.vector_db.get_metadata_field('content_hash')
+        
+        changed = []
+        counts = {"added": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        for i, clause_id in enumerate(ids):
+            if clause_id not in stored_hashes:
+                counts["added"] += 1
+                changed.append(i)
+            elif stored_hashes[clause_id] != metadatas[i]['content_hash']:
+                counts["updated"] += 1
+                changed.append(i)
+            else:
+                counts["unchanged"] += 1
+        
+        current_ids = set(ids)
+        removed_ids = [clause_id for clause_id in stored_hashes if clause_id not in current_ids]
+        counts["deleted"] = len(removed_ids)
+        
+        if changed:
+            print(f"Generating embeddings for {len(changed)} new or changed documents...")
+            embeddings = self.embedder.embed_texts([documents[i] for i in changed])
+            self.vector_db.upsert_documents(
+                ids=[ids[i] for i in changed],
+                documents=[documents[i] for i in changed],
+                embeddings=embeddings,
+                metadatas=[metadatas[i] for i in changed]
+            )
+        
+        self.vector_db.delete_documents(removed_ids)
+        
+        print(f"✓ Sync complete: {counts['added']} added, {counts['updated']} updated, "
+              f"{counts['deleted']} deleted, {counts['unchanged']} unchanged")
+        print(f"✓ Vector database now contains {self.vector_db.get_collection_count()} documents")
+        
+        return counts
+    
+    def _build_records(self, clauses: List[Dict[str, Any]]):
+        """
+        Build vector database records from clause dictionaries.
+        
+        Args:
+            clauses: List of clause dictionaries
+            
+        Returns:
+            Tuple of (ids, documents, metadatas) lists
+        """
         ids = []
         documents = []
         metadatas = []
         
-        for clause in self.clauses_data:
+        for clause in clauses:
             document_text = f"{clause.get('clause_title', '')}: {clause.get('clause_text', '')}"
             
             ids.append(clause['id'])
@@ -146,21 +264,20 @@ class ClauseSystemInitializer:
                 for key, value in clause['metadata'].items():
                     metadata[f'meta_{key}'] = str(value)
             
+            metadata['content_hash'] = self._fingerprint(document_text, metadata)
             metadatas.append(metadata)
         
-        print(f"Generating embeddings for {len(documents)} documents...")
-        embeddings = self.embedder.embed_texts(documents)
-        
-        print(f"Adding documents to vector database...")
-        self.vector_db.add_documents(
-            ids=ids,
-            documents=documents,
-            embeddings=embeddings,
-            metadatas=metadatas
+        return ids, documents, metadatas
+    
+    @staticmethod
+    def _fingerprint(document_text: str, metadata: Dict[str, Any]) -> str:
+        """Compute a stable content hash for a clause document and its metadata."""
+        payload = json.dumps(
+            {"document": document_text, "metadata": metadata},
+            sort_keys=True,
+            ensure_ascii=False
         )
-        
-        print(f"✓ Successfully ingested {len(ids)} clauses")
-        print(f"✓ Vector database now contains {self.vector_db.get_collection_count()} documents")
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
     
     def initialize_retriever(self) -> ClauseRetriever:
         """
@@ -186,12 +303,14 @@ class ClauseSystemInitializer:
         
         return self.retriever
     
-    def initialize_full_system(self, reset_db: bool = False) -> ClauseRetriever:
+    def initialize_full_system(self, reset_db: bool = False, incremental: bool = True) -> ClauseRetriever:
         """
         Initialize the complete system.
         
         Args:
             reset_db: Whether to reset the existing database
+            incremental: Whether to sync an existing collection with the clauses file
+                         instead of skipping ingestion
             
         Returns:
             ClauseRetriever instance ready for use
@@ -208,6 +327,9 @@ class ClauseSystemInitializer:
         if current_count == 0 or reset_db:
             print(f"\nVector database is empty or reset requested. Ingesting data...")
             self.ingest_clauses()
+        elif incremental:
+            print(f"\nVector database contains {current_count} documents. Syncing changes...")
+            self.sync_counts = self.sync_clauses()
         else:
             print(f"\nVector database already contains {current_count} documents. Skipping ingestion.")
             print(f"(Use reset_db=True to re-ingest)")
@@ -223,6 +345,12 @@ class ClauseSystemInitializer:
         print(f"  - Total Clauses: {stats['total_clauses']}")
         print(f"  - Collection Name: {stats['collection_name']}")
         print(f"  - Embedding Dimension: {stats['embedding_dimension']}")
+        if stats.get('partitions'):
+            print(f"  - Partitions: {len(stats['partitions'])}")
+        cache_stats = stats.get('embedding_cache')
+        if cache_stats:
+            print(f"  - Embedding Cache: {cache_stats['memory_hits'] + cache_stats['disk_hits']} hits, "
+                  f"{cache_stats['misses']} misses (hit rate {cache_stats['hit_rate']:.0%})")
         print()
         
         return self.retriever
\ No newline at end of file
@@ -6,8 +6,7 @@ from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langgraph.graph import StateGraph, END
 
-from pypdf import PdfReader
-from docx import Document
+from contract_extract import extract_text
 
 
 # -----------------------------
@@ -22,23 +21,19 @@ class ContractState(TypedDict):
 # -----------------------------
 # 2. File Loader
 # -----------------------------
-def load_contract(file_path: str) -> str:
-    if file_path.endswith(".pdf"):
-        reader = PdfReader(file_path)
-        return "\n".join(page.extract_text() for page in reader.pages if page.extract_text())
-
-    elif file_path.endswith(".docx"):
-        doc = Document(file_path)
-        return "\n".join(p.text for p in doc.paragraphs)
-
-    else:
+def load_contract(file_path: str, max_chars: int = None) -> str:
+    if not file_path.lower().endswith((".pdf", ".docx")):
         raise ValueError("Only PDF and DOCX are supported")
 
+    # Pages are parsed lazily; with max_chars set the rest of the file is never read
+    return extract_text(file_path, max_chars=max_chars)
+
 
 # -----------------------------
 # 3. LLM Classification Node
 # -----------------------------
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+CLASSIFY_MAX_CHARS = 15000
 
 prompt = ChatPromptTemplate.from_template("""
 You are a contract analysis expert.
@@ -90,8 +85,8 @@ app = graph.compile()
 if __name__ == "__main__":
     file_path = "contract_classifier/data/sample_contract.pdf"
 
-    # Load contract text
-    contract_text = load_contract(file_path)
+    # Load contract text; the opening pages are enough to classify it
+    contract_text = load_contract(file_path, max_chars=CLASSIFY_MAX_CHARS)
 
     # Run the classifier
     result = app.invoke({"document_text": contract_text})
@@ -0,0 +1,35 @@
+"""
+Shared document extraction for every project in this repository.
+"""
+
+from .backends import ExtractionBackend
+from .engine import (
+    DEFAULT_PDF_BACKEND,
+    UnsupportedFormatError,
+    available_backends,
+    cached_pages,
+    extract_text,
+    get_backend,
+    iter_pages,
+    page_count,
+    register_backend,
+    store_pages,
+)
+from .store import TextStore, content_hash, get_store
+
+__all__ = [
+    "DEFAULT_PDF_BACKEND",
+    "ExtractionBackend",
+    "TextStore",
+    "UnsupportedFormatError",
+    "available_backends",
+    "cached_pages",
+    "content_hash",
+    "extract_text",
+    "get_backend",
+    "get_store",
+    "iter_pages",
+    "page_count",
+    "register_backend",
+    "store_pages",
+]
@@ -0,0 +1,3 @@
+from .store import main
+
+main()
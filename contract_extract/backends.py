@@ -0,0 +1,213 @@
+"""
+Extraction backends.
+
+Each backend wraps one parsing library behind the same page-iterator
+interface. Libraries are imported lazily, so a missing optional
+dependency only disables its backend.
+"""
+
+import importlib.metadata
+import importlib.util
+import io
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+class ExtractionBackend:
+    """
+    Base class for extraction backends.
+
+    Subclasses set name, module, distributions and extensions, and
+    implement page_count() and iter_pages(). Bump revision whenever a
+    change to the backend alters the text it produces, so stored
+    extractions from the old code are invalidated.
+    """
+
+    name: str = ""
+    module: str = ""
+    # Installed packages whose versions determine the extracted text
+    distributions: Tuple[str, ...] = ()
+    extensions: Tuple[str, ...] = ()
+    revision: int = 1
+    # Whether extractions are worth keeping in the shared text store
+    cacheable: bool = True
+    _version: Optional[str] = None
+
+    def is_available(self) -> bool:
+        """Return True if the library this backend wraps is installed."""
+        return importlib.util.find_spec(self.module) is not None
+
+    def version(self) -> str:
+        """
+        Describe the code producing this backend's text.
+
+        Returns:
+            Backend revision followed by the installed version of each distribution
+        """
+        if self._version is None:
+            parts = [f"r{self.revision}"]
+            for dist in self.distributions:
+                try:
+                    parts.append(f"{dist}={importlib.metadata.version(dist)}")
+                except importlib.metadata.PackageNotFoundError:
+                    parts.append(f"{dist}=?")
+            self._version = " ".join(parts)
+        return self._version
+
+    def page_count(self, path: str) -> int:
+        """
+        Count the pages in a document.
+
+        Args:
+            path: Path to the document
+
+        Returns:
+            Number of pages
+        """
+        raise NotImplementedError
+
+    def iter_pages(self, path: str, pages: Optional[Iterable[int]] = None) -> Iterator[str]:
+        """
+        Yield the text of each page in document order.
+
+        Args:
+            path: Path to the document
+            pages: Optional zero-based page indices to read; all pages if None
+
+        Yields:
+            Text of one page ("" for pages without extractable text)
+        """
+        raise NotImplementedError
+
+
+class PypdfBackend(ExtractionBackend):
+    name = "pypdf"
+    module = "pypdf"
+    distributions = ("pypdf",)
+    extensions = (".pdf",)
+
+    def _reader(self, path: str):
+        from pypdf import PdfReader
+        return PdfReader(path)
+
+    def page_count(self, path: str) -> int:
+        return len(self._reader(path).pages)
+
+    def iter_pages(self, path: str, pages: Optional[Iterable[int]] = None) -> Iterator[str]:
+        reader = self._reader(path)
+        indices = range(len(reader.pages)) if pages is None else sorted(pages)
+        for i in indices:
+            if i < len(reader.pages):
+                yield reader.pages[i].extract_text() or ""
+
+
+class PyPDF2Backend(PypdfBackend):
+    name = "pypdf2"
+    module = "PyPDF2"
+    distributions = ("PyPDF2",)
+
+    def _reader(self, path: str):
+        from PyPDF2 import PdfReader
+        return PdfReader(path)
+
+
+class PdfplumberBackend(ExtractionBackend):
+    name = "pdfplumber"
+    module = "pdfplumber"
+    distributions = ("pdfplumber", "pdfminer.six")
+    extensions = (".pdf",)
+
+    def page_count(self, path: str) -> int:
+        import pdfplumber
+        with pdfplumber.open(path) as pdf:
+            return len(pdf.pages)
+
+    def iter_pages(self, path: str, pages: Optional[Iterable[int]] = None) -> Iterator[str]:
+        import pdfplumber
+        with pdfplumber.open(path) as pdf:
+            indices = range(len(pdf.pages)) if pages is None else sorted(pages)
+            for i in indices:
+                if i >= len(pdf.pages):
+                    continue
+                page = pdf.pages[i]
+                text = page.extract_text() or ""
+                # Drop the page's cached layout objects; they dominate memory on long documents
+                if hasattr(page, "close"):
+                    page.close()
+                yield text
+
+
+class PdfminerBackend(ExtractionBackend):
+    name = "pdfminer"
+    module = "pdfminer"
+    distributions = ("pdfminer.six",)
+    extensions = (".pdf",)
+
+    def page_count(self, path: str) -> int:
+        from pdfminer.pdfparser import PDFParser
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdftypes import resolve1
+        with open(path, "rb") as f:
+            doc = PDFDocument(PDFParser(f))
+            try:
+                return int(resolve1(doc.catalog["Pages"])["Count"])
+            except Exception:
+                return sum(1 for _ in PDFPage.create_pages(doc))
+
+    def iter_pages(self, path: str, pages: Optional[Iterable[int]] = None) -> Iterator[str]:
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        with open(path, "rb") as f:
+            manager = PDFResourceManager(caching=True)
+            out = io.StringIO()
+            device = TextConverter(manager, out, laparams=LAParams())
+            interpreter = PDFPageInterpreter(manager, device)
+            try:
+                for page in PDFPage.get_pages(f, pagenos=set(pages) if pages is not None else None):
+                    interpreter.process_page(page)
+                    # TextConverter ends every page with a form feed
+                    text = out.getvalue().rstrip("\x0c")
+                    out.seek(0)
+                    out.truncate(0)
+                    yield text
+            finally:
+                device.close()
+
+
+class DocxBackend(ExtractionBackend):
+    """DOCX has no fixed pagination, so the whole document is a single page."""
+
+    name = "docx"
+    module = "docx"
+    distributions = ("python-docx",)
+    extensions = (".docx",)
+
+    def page_count(self, path: str) -> int:
+        return 1
+
+    def iter_pages(self, path: str, pages: Optional[Iterable[int]] = None) -> Iterator[str]:
+        if pages is not None and 0 not in set(pages):
+            return
+        from docx import Document
+        doc = Document(path)
+        yield "\n".join(p.text for p in doc.paragraphs)
+
+
+class TextBackend(ExtractionBackend):
+    name = "text"
+    module = "io"
+    # Reading a text file is already as cheap as a store lookup
+    cacheable = False
+    extensions = (".txt", ".md")
+
+    def page_count(self, path: str) -> int:
+        return 1
+
+    def iter_pages(self, path: str, pages: Optional[Iterable[int]] = None) -> Iterator[str]:
+        if pages is not None and 0 not in set(pages):
+            return
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            yield f.read()
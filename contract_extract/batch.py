@@ -0,0 +1,227 @@
+"""
+Parallel batch conversion of PDF/DOCX archives to text or Markdown.
+
+Run from the repository root:
+    python -m contract_extract.batch contracts/ -o converted --format md --workers 8
+    python -m contract_extract.batch "archive/**/*.pdf" -o converted
+
+Every finished file is appended to <output>/manifest.jsonl. Re-running
+the same command resumes: files whose content hash matches their last
+successful conversion are skipped, and a failure in one file is recorded
+in the manifest without stopping the batch.
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any
+
+from .engine import extract_text
+from .store import content_hash
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+MANIFEST_NAME = "manifest.jsonl"
+PROGRESS_EVERY = 100
+
+
+def collect_inputs(inputs: List[str]) -> List[str]:
+    """
+    Expand directories (recursively) and glob patterns into supported files.
+
+    Args:
+        inputs: Files, directories or glob patterns
+
+    Returns:
+        Sorted, de-duplicated absolute file paths
+    """
+    files = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                files.update(os.path.join(root, n) for n in names)
+        elif os.path.isfile(item):
+            files.add(item)
+        else:
+            files.update(glob.glob(item, recursive=True))
+    return sorted(os.path.abspath(f) for f in files if f.lower().endswith(SUPPORTED_EXTENSIONS) and os.path.isfile(f))
+
+
+def output_names(files: List[str], output_format: str) -> Dict[str, str]:
+    """
+    Map each input to an output path relative to the output directory.
+
+    The input tree below the common root is mirrored; if two inputs share a
+    stem (report.pdf and report.docx) both keep their original extension.
+    """
+    if not files:
+        return {}
+    root = os.path.commonpath([os.path.dirname(f) for f in files])
+    stems = {f: os.path.splitext(os.path.relpath(f, root))[0] for f in files}
+    counts: Dict[str, int] = {}
+    for stem in stems.values():
+        counts[stem] = counts.get(stem, 0) + 1
+    return {
+        f: (stem if counts[stem] == 1 else stem + "_" + os.path.splitext(f)[1][1:].lower()) + "." + output_format
+        for f, stem in stems.items()
+    }
+
+
+def load_manifest(output_dir: str) -> Dict[str, Dict[str, Any]]:
+    """Read the manifest; the last record for each source wins."""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    entries: Dict[str, Dict[str, Any]] = {}
+    if not os.path.exists(path):
+        return entries
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A run killed mid-write can leave a truncated last line
+                continue
+            entries[record["source"]] = record
+    return entries
+
+
+def convert_file(
+    source: str,
+    output_path: str,
+    output_format: str = "txt",
+    previous_hash: Optional[str] = None,
+    backend: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Convert one file; runs inside a pool worker and never raises.
+
+    Returns:
+        Manifest record with status "converted", "unchanged" or "failed"
+    """
+    start = time.perf_counter()
+    record: Dict[str, Any] = {"source": source, "output": output_path, "format": output_format}
+    try:
+        stat = os.stat(source)
+        record.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=content_hash(source))
+        if record["sha256"] == previous_hash and os.path.exists(output_path):
+            record["status"] = "unchanged"
+            return record
+
+        text = extract_text(source, backend=backend)
+        if output_format == "md":
+            text = "# Parsed Legal Contract\n" + text
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        tmp = f"{output_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, output_path)
+        record.update(status="converted", chars=len(text))
+    except Exception as e:
+        record.update(status="failed", error=f"{type(e).__name__}: {e}")
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def convert_batch(
+    inputs: List[str],
+    output_dir: str = "output_files",
+    output_format: str = "txt",
+    workers: Optional[int] = None,
+    backend: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Convert many files across a process pool.
+
+    Args:
+        inputs: Files, directories or glob patterns
+        output_dir: Directory receiving the converted files and the manifest
+        output_format: "txt" or "md"
+        workers: Worker processes (default: CPU count)
+        backend: Optional extraction backend name for PDFs
+
+    Returns:
+        Summary counts and throughput
+    """
+    files = collect_inputs(inputs)
+    names = output_names(files, output_format)
+    os.makedirs(output_dir, exist_ok=True)
+    previous = load_manifest(output_dir)
+
+    summary = {"files": len(files), "converted": 0, "unchanged": 0, "failed": 0, "bytes": 0}
+    pending = []
+    for source in files:
+        output_path = os.path.abspath(os.path.join(output_dir, names[source]))
+        last = previous.get(source)
+        ok = last is not None and last.get("status") in ("converted", "unchanged") and os.path.exists(output_path)
+        if ok:
+            stat = os.stat(source)
+            # Same size and mtime as last time: skip without even hashing
+            if last.get("size") == stat.st_size and last.get("mtime_ns") == stat.st_mtime_ns:
+                summary["unchanged"] += 1
+                continue
+        pending.append((source, output_path, last.get("sha256") if ok else None))
+
+    start = time.perf_counter()
+    done = 0
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(manifest_path, "a", encoding="utf-8") as manifest, \
+            ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(convert_file, source, output_path, output_format, previous_hash, backend): source
+            for source, output_path, previous_hash in pending
+        }
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                # Only reached if the worker process itself died
+                record = {"source": futures[future], "status": "failed", "error": f"{type(e).__name__}: {e}"}
+            manifest.write(json.dumps(record) + "\n")
+            manifest.flush()
+
+            summary[record["status"]] += 1
+            if record["status"] == "converted":
+                summary["bytes"] += record.get("size", 0)
+            elif record["status"] == "failed":
+                print(f"failed: {record['source']}: {record['error']}")
+            done += 1
+            if done % PROGRESS_EVERY == 0:
+                _print_progress(done, len(pending), summary, time.perf_counter() - start)
+
+    elapsed = time.perf_counter() - start
+    summary["seconds"] = round(elapsed, 2)
+    summary["files_per_second"] = round(summary["converted"] / elapsed, 2) if elapsed else 0.0
+    summary["bytes_per_second"] = round(summary["bytes"] / elapsed) if elapsed else 0
+    return summary
+
+
+def _print_progress(done: int, total: int, summary: Dict[str, Any], elapsed: float):
+    print(f"{done}/{total} processed, {summary['converted'] / elapsed:.1f} files/s, "
+          f"{summary['bytes'] / elapsed / 1e6:.2f} MB/s, {summary['failed']} failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default="output_files", help="Output directory")
+    parser.add_argument("--format", choices=("txt", "md"), default="txt")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--backend", help="PDF extraction backend")
+    args = parser.parse_args()
+    run(args.inputs, args.output, args.format, args.workers, args.backend)
+
+
+def run(inputs: List[str], output_dir: str, output_format: str = "txt", workers: Optional[int] = None, backend: Optional[str] = None):
+    """Convert a batch and print the summary; shared by the project entry points."""
+    summary = convert_batch(inputs, output_dir, output_format, workers, backend)
+    print(f"{summary['files']} files: {summary['converted']} converted, {summary['unchanged']} unchanged, "
+          f"{summary['failed']} failed in {summary['seconds']}s "
+          f"({summary['files_per_second']} files/s, {summary['bytes_per_second'] / 1e6:.2f} MB/s)")
+    print(f"Manifest: {os.path.join(output_dir, MANIFEST_NAME)}")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Throughput and memory benchmark for the extraction backends.
+
+Run from the repository root:
+    python -m contract_extract.bench contract_type/input_files_2 contract_lang/input_files
+    python -m contract_extract.bench --synthetic 200 --repeat 3
+
+Each backend runs in its own fresh process so peak memory is not
+inflated by the libraries or caches of the backend measured before it.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+
+def _peak_rss_bytes() -> int:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _run_backend(backend: str, files: List[str], repeat: int) -> Dict[str, float]:
+    """Extract every file `repeat` times with one backend; runs in a child process."""
+    import importlib
+    from contract_extract import get_backend
+
+    # Import the library before the baseline so only extraction itself is measured
+    for path in files:
+        importlib.import_module(get_backend(path, backend if path.lower().endswith(".pdf") else None).module)
+    baseline = _peak_rss_bytes()
+
+    timings, pages, chars = [], 0, 0
+    for _ in range(repeat):
+        pages, chars = 0, 0
+        start = time.perf_counter()
+        for path in files:
+            chosen = get_backend(path, backend if path.lower().endswith(".pdf") else None)
+            for text in chosen.iter_pages(path):
+                pages += 1
+                chars += len(text)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "seconds": statistics.median(timings),
+        "pages": pages,
+        "chars": chars,
+        "peak_rss_growth": max(0, _peak_rss_bytes() - baseline),
+    }
+
+
+def _collect(paths: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names) if n.lower().endswith((".pdf", ".docx")))
+        elif path.lower().endswith((".pdf", ".docx")):
+            files.append(path)
+    return files
+
+
+def _synthetic_pdf(pages: int, directory: str) -> str:
+    """Write a contract-like PDF with the given number of pages using reportlab."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    path = os.path.join(directory, f"synthetic_{pages}p.pdf")
+    c = canvas.Canvas(path, pagesize=letter)
+    for page in range(pages):
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(40, 750, f"Section {page + 1}. Obligations of the Parties")
+        c.setFont("Helvetica", 10)
+        for line in range(50):
+            c.drawString(40, 730 - line * 13, f"{page + 1}.{line + 1} The Supplier shall perform the Services with reasonable skill and care "
+                                              f"and in accordance with Good Industry Practice.")
+        c.showPage()
+    c.save()
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help="PDF/DOCX files or directories to benchmark")
+    parser.add_argument("--backends", help="Comma-separated PDF backends (default: every installed one)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Also benchmark a generated PDF with this many pages")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per backend; the median is reported")
+    parser.add_argument("--json", help="Write the results to this file as JSON")
+    args = parser.parse_args()
+
+    from contract_extract import available_backends
+
+    workdir = tempfile.mkdtemp()
+    files = _collect(args.paths)
+    if args.synthetic:
+        files.append(_synthetic_pdf(args.synthetic, workdir))
+    if not files:
+        parser.error("no PDF or DOCX files to benchmark")
+
+    backends = args.backends.split(",") if args.backends else available_backends(".pdf")
+    total_bytes = sum(os.path.getsize(f) for f in files)
+    print(f"{len(files)} files, {total_bytes / 1e6:.2f} MB, backends: {', '.join(backends)}\n")
+
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    print(f"{'backend':<12}{'pages':>8}{'seconds':>10}{'pages/s':>10}{'MB/s':>8}{'chars':>10}{'peak MB':>10}")
+    print("-" * 68)
+    for backend in backends:
+        with ctx.Pool(1) as pool:
+            r = pool.apply(_run_backend, (backend, files, args.repeat))
+        r["pages_per_second"] = r["pages"] / r["seconds"] if r["seconds"] else 0.0
+        r["mb_per_second"] = total_bytes / 1e6 / r["seconds"] if r["seconds"] else 0.0
+        results[backend] = r
+        print(f"{backend:<12}{r['pages']:>8}{r['seconds']:>10.3f}{r['pages_per_second']:>10.1f}"
+              f"{r['mb_per_second']:>8.2f}{r['chars']:>10}{r['peak_rss_growth'] / 1e6:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"files": files, "bytes": total_bytes, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Backend registry and the extraction entry points every project shares.
+"""
+
+import os
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .backends import (
+    ExtractionBackend,
+    PypdfBackend,
+    PyPDF2Backend,
+    PdfplumberBackend,
+    PdfminerBackend,
+    DocxBackend,
+    TextBackend,
+)
+from .store import get_store
+
+
+# Chosen from `python -m contract_extract.bench`; override per deployment with the environment variable
+DEFAULT_PDF_BACKEND = os.environ.get("CONTRACT_EXTRACT_PDF_BACKEND", "pypdf")
+# Tried in this order when the configured PDF backend is not installed
+PDF_FALLBACK_ORDER = ("pypdf", "pdfminer", "pdfplumber", "pypdf2")
+
+_BACKENDS: Dict[str, ExtractionBackend] = {}
+
+
+class UnsupportedFormatError(ValueError):
+    """Raised when no registered backend handles a file's extension."""
+
+
+def register_backend(backend: ExtractionBackend) -> None:
+    """
+    Register a backend, replacing any existing backend with the same name.
+
+    Args:
+        backend: Backend instance to register
+    """
+    _BACKENDS[backend.name] = backend
+
+
+for _backend in (PypdfBackend(), PyPDF2Backend(), PdfplumberBackend(), PdfminerBackend(), DocxBackend(), TextBackend()):
+    register_backend(_backend)
+
+
+def available_backends(extension: Optional[str] = None) -> List[str]:
+    """
+    List the installed backends, optionally only those handling an extension.
+
+    Args:
+        extension: File extension such as ".pdf"
+
+    Returns:
+        Backend names
+    """
+    return [
+        name for name, backend in _BACKENDS.items()
+        if backend.is_available() and (extension is None or extension.lower() in backend.extensions)
+    ]
+
+
+def get_backend(path: str, backend: Optional[str] = None) -> ExtractionBackend:
+    """
+    Pick the backend for a file.
+
+    Args:
+        path: Path to the document; its extension selects the backend family
+        backend: Optional backend name overriding the default
+
+    Returns:
+        Backend instance
+
+    Raises:
+        UnsupportedFormatError: If no installed backend handles the file
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if backend is not None:
+        chosen = _BACKENDS.get(backend)
+        if chosen is None:
+            raise UnsupportedFormatError(f"Unknown extraction backend: {backend}")
+        if extension not in chosen.extensions:
+            raise UnsupportedFormatError(f"Backend {backend} does not handle {extension} files")
+        return chosen
+
+    candidates = available_backends(extension)
+    if extension == ".pdf":
+        for name in (DEFAULT_PDF_BACKEND,) + PDF_FALLBACK_ORDER:
+            if name in candidates:
+                return _BACKENDS[name]
+    if candidates:
+        return _BACKENDS[candidates[0]]
+    raise UnsupportedFormatError(f"Unsupported file format: {extension or path}")
+
+
+def iter_pages(path: str, backend: Optional[str] = None, pages: Optional[Iterable[int]] = None) -> Iterator[str]:
+    """
+    Yield the text of each page of a document.
+
+    Args:
+        path: Path to a PDF, DOCX or text file
+        backend: Optional backend name overriding the default
+        pages: Optional zero-based page indices to read
+
+    Yields:
+        Text of one page
+    """
+    return get_backend(path, backend).iter_pages(path, pages)
+
+
+def page_count(path: str, backend: Optional[str] = None) -> int:
+    """
+    Count the pages in a document.
+
+    Args:
+        path: Path to the document
+        backend: Optional backend name overriding the default
+
+    Returns:
+        Number of pages
+    """
+    return get_backend(path, backend).page_count(path)
+
+
+def cached_pages(path: str, backend: Optional[str] = None) -> Optional[List[str]]:
+    """
+    Look a document up in the shared text store without parsing it.
+
+    Args:
+        path: Path to the document
+        backend: Optional backend name overriding the default
+
+    Returns:
+        Text of every page, or None if the document is not stored (or caching is off)
+    """
+    chosen = get_backend(path, backend)
+    store = get_store() if chosen.cacheable else None
+    if store is None:
+        return None
+    try:
+        return store.get(path, chosen)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def store_pages(path: str, pages: List[str], backend: Optional[str] = None) -> None:
+    """
+    Save the text of every page of a fully parsed document in the shared text store.
+
+    Failures to write are ignored; the store only ever saves work.
+
+    Args:
+        path: Path to the document
+        pages: Text of every page, in order
+        backend: Backend name the pages were parsed with (default backend if None)
+    """
+    chosen = get_backend(path, backend)
+    store = get_store() if chosen.cacheable else None
+    if store is None:
+        return
+    try:
+        store.put(path, chosen, pages)
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def _join_pages(
+    page_iter: Iterator[str],
+    separator: str,
+    max_chars: Optional[int],
+    max_pages: Optional[int]
+) -> str:
+    parts: List[str] = []
+    collected = 0
+    try:
+        for read, text in enumerate(page_iter, start=1):
+            if text:
+                parts.append(text)
+                collected += len(text) + len(separator)
+            if (max_chars is not None and collected >= max_chars) or (max_pages is not None and read >= max_pages):
+                break
+    finally:
+        # Closing the generator releases the backend's open file right away
+        page_iter.close()
+
+    text = separator.join(parts)
+    return text[:max_chars] if max_chars is not None else text
+
+
+def extract_text(
+    path: str,
+    backend: Optional[str] = None,
+    pages: Optional[Iterable[int]] = None,
+    separator: str = "\n",
+    max_chars: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    use_cache: bool = True
+) -> str:
+    """
+    Extract the text of a document.
+
+    The shared text store is consulted first, so a document any project
+    has already parsed in full is served without parsing it again. On a
+    miss pages are parsed lazily: with max_chars or max_pages set only the
+    leading pages a caller needs are parsed (and nothing is stored),
+    otherwise the full parse is stored for the next caller.
+
+    Args:
+        path: Path to a PDF, DOCX or text file
+        backend: Optional backend name overriding the default
+        pages: Optional zero-based page indices to read
+        separator: String placed between pages
+        max_chars: Stop once this many characters are collected; the result is cut to this length
+        max_pages: Stop after parsing this many pages
+        use_cache: Consult and fill the shared text store
+
+    Returns:
+        Text of the non-empty pages joined by separator
+    """
+    chosen = get_backend(path, backend)
+    stored = cached_pages(path, chosen.name) if use_cache else None
+    if stored is not None:
+        if pages is not None:
+            stored = [stored[i] for i in sorted(set(pages)) if i < len(stored)]
+        return _join_pages((text for text in stored), separator, max_chars, max_pages)
+
+    if pages is None and max_chars is None and max_pages is None:
+        parsed = list(chosen.iter_pages(path))
+        if use_cache:
+            store_pages(path, parsed, chosen.name)
+        return separator.join(text for text in parsed if text)
+
+    return _join_pages(chosen.iter_pages(path, pages), separator, max_chars, max_pages)
@@ -0,0 +1,304 @@
+"""
+Content-addressed store of extracted text shared by every extractor.
+
+Entries are keyed by the SHA-256 of the source file together with the
+backend name and version that produced the text, so a renamed or copied
+file is still a hit and upgrading a parsing library (or bumping a
+backend's revision) invalidates its old entries. Page texts are kept
+zlib-compressed under <dir>/objects/ with a SQLite index beside them;
+once the store grows past its size limit the least recently used
+entries are evicted.
+
+    python -m contract_extract stats
+    python -m contract_extract clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from .backends import ExtractionBackend
+
+STORE_DIR = os.environ.get(
+    "CONTRACT_EXTRACT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "contract_extract")
+)
+STORE_MAX_BYTES = int(os.environ.get("CONTRACT_EXTRACT_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+STORE_ENABLED = os.environ.get("CONTRACT_EXTRACT_CACHE", "1").lower() not in ("0", "false", "no", "off")
+# Bump when the on-disk layout changes; a store written in another format is wiped on open
+STORE_FORMAT = "1"
+# Eviction trims to this fraction of the limit so every insert near the limit does not evict again
+EVICT_TO_FRACTION = 0.9
+COMPRESSION_LEVEL = 6
+HASH_CHUNK_BYTES = 1024 * 1024
+HASH_MEMO_SIZE = 4096
+
+_hash_memo: Dict[Tuple[str, int, int], str] = {}
+_store: Optional["TextStore"] = None
+_store_pid: Optional[int] = None
+# A store inherited across fork is kept referenced, never closed: closing it could release the parent's locks
+_inherited: List["TextStore"] = []
+
+
+def content_hash(path: str) -> str:
+    """
+    SHA-256 of a file's content.
+
+    The digest is remembered per (path, size, mtime) for the life of the
+    process, so looking up and then storing the same file hashes it once.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex digest
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    digest = _hash_memo.get(memo_key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        if len(_hash_memo) >= HASH_MEMO_SIZE:
+            _hash_memo.clear()
+        _hash_memo[memo_key] = digest
+    return digest
+
+
+class TextStore:
+    """Compressed on-disk page-text store with a SQLite index and LRU eviction by size."""
+
+    def __init__(self, directory: str = STORE_DIR, max_bytes: int = STORE_MAX_BYTES):
+        """
+        Open (or create) a store.
+
+        Args:
+            directory: Directory holding the index and the compressed objects
+            max_bytes: Compressed size above which least recently used entries are evicted
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        # Pool workers and separate projects share the index, so wait on locks rather than fail
+        self._conn = sqlite3.connect(os.path.join(directory, "index.sqlite3"), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, sha256 TEXT NOT NULL, backend TEXT NOT NULL, version TEXT NOT NULL, "
+            "pages INTEGER NOT NULL, chars INTEGER NOT NULL, bytes INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_accessed ON entries (accessed)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_source ON entries (sha256, backend)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'format'").fetchone()
+        if row is None or row[0] != STORE_FORMAT:
+            self._clear_locked()
+            self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('format', ?)", (STORE_FORMAT,))
+        self._conn.commit()
+
+    def make_key(self, sha256: str, backend: ExtractionBackend) -> str:
+        """
+        Build the store key for a file under a backend.
+
+        Args:
+            sha256: Content hash of the source file
+            backend: Backend that produces the text
+
+        Returns:
+            Hex digest identifying the (content, backend, version) triple
+        """
+        digest = hashlib.sha256()
+        for part in (sha256, backend.name, backend.version(), STORE_FORMAT):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _object_path(self, key: str) -> str:
+        return os.path.join(self.directory, "objects", key[:2], key + ".zz")
+
+    def get(self, path: str, backend: ExtractionBackend) -> Optional[List[str]]:
+        """
+        Look up the page texts of a file.
+
+        Args:
+            path: Path to the source document
+            backend: Backend the caller would parse the file with
+
+        Returns:
+            Text of every page, or None on a miss
+        """
+        key = self.make_key(content_hash(path), backend)
+        with self._lock:
+            row = self._conn.execute("SELECT key FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            try:
+                with open(self._object_path(key), "rb") as f:
+                    pages = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+            except (OSError, ValueError, zlib.error):
+                # Object removed or damaged behind the index's back; forget the entry and reparse
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            return pages
+
+    def put(self, path: str, backend: ExtractionBackend, pages: List[str]) -> None:
+        """
+        Store the page texts of a fully parsed file.
+
+        Entries for the same file from older versions of the backend are
+        removed, and the store is trimmed if it grew past its size limit.
+
+        Args:
+            path: Path to the source document
+            backend: Backend that produced the text
+            pages: Text of every page, in order
+        """
+        sha256 = content_hash(path)
+        key = self.make_key(sha256, backend)
+        blob = zlib.compress(json.dumps(pages, ensure_ascii=False).encode("utf-8"), COMPRESSION_LEVEL)
+
+        object_path = self._object_path(key)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        tmp = f"{object_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, object_path)
+
+        now = time.time()
+        with self._lock:
+            stale = self._conn.execute(
+                "SELECT key FROM entries WHERE sha256 = ? AND backend = ? AND version != ?",
+                (sha256, backend.name, backend.version())
+            ).fetchall()
+            self._delete_locked([k for (k,) in stale])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, sha256, backend, version, pages, chars, bytes, created, accessed, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, sha256, backend.name, backend.version(), len(pages), sum(len(p) for p in pages), len(blob), now, now)
+            )
+            self._conn.commit()
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        """Drop least recently used entries once the store is over its size limit."""
+        total = self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * EVICT_TO_FRACTION
+        victims = []
+        for key, size in self._conn.execute("SELECT key, bytes FROM entries ORDER BY accessed"):
+            if total <= target:
+                break
+            victims.append(key)
+            total -= size
+        self._delete_locked(victims)
+        self._conn.commit()
+        self.evictions += len(victims)
+
+    def _delete_locked(self, keys: List[str]) -> None:
+        for key in keys:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            try:
+                os.remove(self._object_path(key))
+            except FileNotFoundError:
+                pass
+
+    def _clear_locked(self) -> None:
+        keys = [k for (k,) in self._conn.execute("SELECT key FROM entries")]
+        self._delete_locked(keys)
+
+    def clear(self) -> None:
+        """Drop every stored entry."""
+        with self._lock:
+            self._clear_locked()
+            self._conn.commit()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get size and hit statistics for the store.
+
+        Returns:
+            Dictionary with this process's counters and the store-wide totals
+        """
+        with self._lock:
+            entries, stored_bytes, chars, total_hits = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0), COALESCE(SUM(chars), 0), COALESCE(SUM(hits), 0) FROM entries"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "directory": self.directory,
+                "entries": entries,
+                "bytes": stored_bytes,
+                "max_bytes": self.max_bytes,
+                "text_chars": chars,
+                "total_hits": total_hits,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions
+            }
+
+    def close(self) -> None:
+        """Close the index."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def get_store() -> Optional[TextStore]:
+    """
+    Return the process-wide store, or None when caching is disabled.
+
+    A forked worker gets a fresh store rather than the parent's SQLite
+    connection, which must not be shared across processes.
+    """
+    global _store, _store_pid, STORE_ENABLED
+    if not STORE_ENABLED:
+        return None
+    if _store is None or _store_pid != os.getpid():
+        if _store is not None:
+            _inherited.append(_store)
+        try:
+            _store = TextStore()
+        except (OSError, sqlite3.Error):
+            # An unwritable cache directory only costs the speedup, never the extraction
+            STORE_ENABLED = False
+            _store = None
+            return None
+        _store_pid = os.getpid()
+    return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m contract_extract", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("command", choices=("stats", "clear"), help="Show the shared text store's size or empty it")
+    args = parser.parse_args()
+
+    store = TextStore()
+    if args.command == "clear":
+        store.clear()
+    print(json.dumps(store.get_statistics(), indent=2))
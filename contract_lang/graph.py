@@ -1,3 +1,13 @@
+import hashlib
+import operator
+import os
+import threading
+import time
+import warnings
+from typing import Annotated, Any, List, TypedDict
+
+from langgraph.graph import StateGraph, START, END
+
 from nodes.extract_node import extract_text_node
 from nodes.classify_node import classify_contract_node
 from nodes.retrieve_node import retrieve_clauses_node
@@ -6,20 +16,135 @@ from nodes.create_review_plan_node import create_review_plan_node
 from nodes.execute_step_node import execute_step_node
 from nodes.generate_final_report_node import generate_final_report_node
 
+# Next to this file rather than in the working directory, so every run finds the same checkpoints
+CHECKPOINT_DB = os.environ.get(
+    "CONTRACT_LANG_CHECKPOINT_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "checkpoints.sqlite")
+)
+
+_checkpointer = None
+_checkpointer_lock = threading.Lock()
+
+
+class ContractReviewState(TypedDict, total=False):
+    file_path: str
+    contract_text: str
+    contract_type: str
+    retrieved_clauses: List[Any]
+    contract_segments: List[str]
+    analysis_result: str
+    review_plan: List[dict]
+    role_based_reviews: List[dict]
+    missing_clauses: List[str]
+    suggestions: List[str]
+    final_report: str
+    review_concurrency: int
+    review_timeout: int
+    # Every node appends its own entry, so parallel branches are merged
+    node_timings: Annotated[List[dict], operator.add]
+
+
+def _timed(name: str, node):
+    def run(state: dict) -> dict:
+        start = time.perf_counter()
+        update = node(state)
+        seconds = round(time.perf_counter() - start, 3)
+        print(f"⏱️ {name} finished in {seconds}s")
+        return {**update, "node_timings": [{"node": name, "seconds": seconds}]}
+    return run
+
+
+def _default_checkpointer():
+    """Return the process-wide checkpointer that every compiled graph shares."""
+    global _checkpointer
+    with _checkpointer_lock:
+        if _checkpointer is None:
+            try:
+                import sqlite3
+                from langgraph.checkpoint.sqlite import SqliteSaver
+                _checkpointer = SqliteSaver(sqlite3.connect(CHECKPOINT_DB, check_same_thread=False))
+            except ImportError:
+                from langgraph.checkpoint.memory import MemorySaver
+                message = (
+                    "langgraph-checkpoint-sqlite is not installed: contract review checkpoints are kept "
+                    "in memory and a run interrupted by a crash or restart starts over. "
+                    "Install it with `pip install -r contract_lang/requirements.txt`."
+                )
+                warnings.warn(message, RuntimeWarning)
+                print(f"⚠️ {message}")
+                _checkpointer = MemorySaver()
+        return _checkpointer
+
+
+def create_graph(checkpointer=None):
+    """
+    Contract review pipeline as a LangGraph DAG.
+
+    extract -> classify -> retrieve -> analyze --------------------> final report
+                       \\-> review plan -> (with retrieve) execute --/
+
+    Analysis and the role-based reviews only depend on classification
+    and retrieval, so they run in parallel.
+    """
+    workflow = StateGraph(ContractReviewState)
+
+    workflow.add_node("extract_text", _timed("extract_text", extract_text_node))
+    workflow.add_node("classify_contract", _timed("classify_contract", classify_contract_node))
+    workflow.add_node("retrieve_clauses", _timed("retrieve_clauses", retrieve_clauses_node))
+    workflow.add_node("analyze_contract", _timed("analyze_contract", analyze_contract_node))
+    workflow.add_node("create_review_plan", _timed("create_review_plan", create_review_plan_node))
+    workflow.add_node("execute_step", _timed("execute_step", execute_step_node))
+    workflow.add_node("generate_final_report", _timed("generate_final_report", generate_final_report_node))
+
+    workflow.add_edge(START, "extract_text")
+    workflow.add_edge("extract_text", "classify_contract")
+    workflow.add_edge("classify_contract", "retrieve_clauses")
+    workflow.add_edge("classify_contract", "create_review_plan")
+    workflow.add_edge("retrieve_clauses", "analyze_contract")
+    workflow.add_edge(["retrieve_clauses", "create_review_plan"], "execute_step")
+    workflow.add_edge(["analyze_contract", "execute_step"], "generate_final_report")
+    workflow.add_edge("generate_final_report", END)
+
+    return workflow.compile(checkpointer=checkpointer or _default_checkpointer())
+
+
+def _default_thread_id(file_path: str) -> str:
+    # Path plus size and mtime, so an edited file starts a fresh run
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def build_graph(state: dict, thread_id: str = None, checkpointer=None, force: bool = False):
+    """
+    Run the review pipeline for state["file_path"].
+
+    Runs are checkpointed per thread_id (by default derived from the file),
+    so if a run crashed part way, calling this again resumes after the last
+    completed node instead of redoing extraction and LLM calls. A file that
+    was already fully reviewed returns the checkpointed result unless
+    force=True.
+    """
+    graph = create_graph(checkpointer)
 
-def build_graph(state: dict):
-    from nodes.extract_node import extract_text_node
-    from nodes.classify_node import classify_contract_node
-    from nodes.retrieve_node import retrieve_clauses_node
-    from nodes.analyze_node import analyze_contract_node
+    if thread_id is None:
+        thread_id = _default_thread_id(state["file_path"])
+    if force:
+        thread_id = f"{thread_id}:{time.time_ns()}"
+    config = {"configurable": {"thread_id": thread_id}}
 
-    state.update(extract_text_node(state))
-    state.update(classify_contract_node(state))
-    state.update(retrieve_clauses_node(state))
-    state.update(analyze_contract_node(state))
+    snapshot = graph.get_state(config)
+    if snapshot.next:
+        print(f"🔁 Resuming from checkpoint before: {', '.join(snapshot.next)}")
+        final_state = graph.invoke(None, config)
+    elif snapshot.values.get("final_report"):
+        print("♻️ Contract already reviewed, returning checkpointed report")
+        final_state = snapshot.values
+    else:
+        final_state = graph.invoke(state, config)
 
-    # 🔽 NEW NODES START HERE 🔽
-    state.update(create_review_plan_node(state))
-    state.update(execute_step_node(state))
-    state.update(generate_final_report_node(state))
+    print("\n⏱️ NODE TIMINGS")
+    for entry in final_state.get("node_timings", []):
+        print(f"- {entry['node']}: {entry['seconds']}s")
 
+    state.update(final_state)
+    return final_state
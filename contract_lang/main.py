@@ -1,10 +1,13 @@
 from graph import build_graph
 from vector_store import init_vector_db
+from retrieval_service import get_retrieval_service
 
 if __name__ == "__main__":
     # Run once (comment after first run)
     init_vector_db()
 
+    get_retrieval_service().warm_up()
+
     state = {
         "file_path": "input_files/agreement.docx"
     }
@@ -1,23 +1,18 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 from langchain_ollama import ChatOllama
 
 llm = ChatOllama(model="llama3")
 
-def execute_step_node(state: dict) -> dict:
-    contract_text = state.get("contract_text", "")
-    retrieved_clauses = state.get("retrieved_clauses", [])
-    review_plan = state.get("review_plan", [])
+# Both can be overridden per run through the state
+MAX_CONCURRENT_REVIEWS = 3
+ROLE_TIMEOUT_SECONDS = 300
 
-    reviews = []
 
-    for step in review_plan:
-        role = step["role"]
-        focus = step["focus"]
-
-        reference_text = "\n\n".join(
-            [c.page_content for c in retrieved_clauses]
-        )
-
-        prompt = f"""
+def _review_prompt(role: str, focus: str, contract_text: str, reference_text: str) -> str:
+    return f"""
 You are acting as a {role}.
 
 Focus areas:
@@ -35,11 +30,68 @@ Tasks:
 3. Provide improvement suggestions
 """
 
-        response = llm.invoke(prompt)
 
-        reviews.append({
-            "role": role,
-            "analysis": response.content
-        })
+def execute_step_node(state: dict) -> dict:
+    contract_text = state.get("contract_text", "")
+    retrieved_clauses = state.get("retrieved_clauses", [])
+    review_plan = state.get("review_plan", [])
+    max_workers = state.get("review_concurrency", MAX_CONCURRENT_REVIEWS)
+    role_timeout = state.get("review_timeout", ROLE_TIMEOUT_SECONDS)
+
+    if not review_plan:
+        return {"role_based_reviews": []}
+
+    # Same reference block for every role, so build it once
+    reference_text = "\n\n".join(
+        [c.page_content for c in retrieved_clauses]
+    )
+
+    started = {}
+
+    def run_review(index: int, step: dict):
+        started[index] = time.monotonic()
+        prompt = _review_prompt(step["role"], step["focus"], contract_text, reference_text)
+        return llm.invoke(prompt).content
+
+    workers = max(1, min(max_workers, len(review_plan)))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = [
+        executor.submit(run_review, i, step)
+        for i, step in enumerate(review_plan)
+    ]
+    # Backstop for the whole node: every wave of roles using its full timeout
+    deadline = time.monotonic() + role_timeout * math.ceil(len(review_plan) / workers)
+    # Workers still held by a call that timed out; a thread cannot be killed, so they never free up
+    abandoned = 0
+
+    reviews = []
+    for i, (step, future) in enumerate(zip(review_plan, futures)):
+        role = step["role"]
+        try:
+            # A running role gets role_timeout from when it actually started;
+            # a queued one waits until the node deadline or until no worker can take it
+            while not future.done():
+                begin = started.get(i)
+                if begin is None and abandoned >= workers:
+                    raise TimeoutError("not started, every worker is held by a review that timed out")
+                limit = min(deadline, begin + role_timeout) if begin is not None else deadline
+                remaining = limit - time.monotonic()
+                if remaining <= 0:
+                    if begin is None:
+                        raise TimeoutError("not started within the review deadline")
+                    raise TimeoutError(f"no response after {role_timeout}s")
+                wait([future], timeout=min(remaining, 1.0))
+            reviews.append({"role": role, "analysis": future.result()})
+        except Exception as e:
+            print(f"⚠️ {role} review failed: {e}")
+            if not future.cancel() and not future.done():
+                abandoned += 1
+            reviews.append({
+                "role": role,
+                "analysis": f"Review unavailable ({type(e).__name__}: {e})",
+                "error": str(e)
+            })
+
+    executor.shutdown(wait=False, cancel_futures=True)
 
     return {"role_based_reviews": reviews}
@@ -1,19 +1,16 @@
-from docx import Document
-from pypdf import PdfReader
+import sys
+from pathlib import Path
+
+# The shared extraction package lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from contract_extract import extract_text
 
 def extract_text_node(state: dict):
     file_path = state["file_path"]
     text = ""
 
-    if file_path.endswith(".docx"):
-        doc = Document(file_path)
-        text = "\n".join(p.text for p in doc.paragraphs if p.text)
-
-    elif file_path.endswith(".pdf"):
-        reader = PdfReader(file_path)
-        for page in reader.pages:
-            if page.extract_text():
-                text += page.extract_text()
+    if file_path.endswith((".docx", ".pdf")):
+        text = extract_text(file_path)
 
     print("✅ Contract text extracted")
     return {"contract_text": text}
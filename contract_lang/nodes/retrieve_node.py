@@ -1,33 +1,45 @@
-from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
+from retrieval_service import get_retrieval_service
+from segmenter import segment_contract
 
-PERSIST_DIR = "vector_db"
+PER_SEGMENT_K = 3
+MAX_RESULTS = 10
 
 def retrieve_clauses_node(state: dict):
     """
     Retrieves relevant clauses from vector DB
     filtered by classified contract type
+
+    The contract is split into clause-sized segments drawn from across
+    the whole document (long contracts are sampled, see segment_contract),
+    all segments are embedded in one batch, and the per-segment matches
+    are merged and deduplicated.
     """
 
     contract_type = state["contract_type"]
     contract_text = state["contract_text"]
 
-    embeddings = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2"
-    )
+    service = get_retrieval_service()
+
+    segments = segment_contract(contract_text) or [contract_text]
+    segment_embeddings = service.embed_documents(segments)
 
-    db = Chroma(
-        persist_directory=PERSIST_DIR,
-        embedding_function=embeddings
-    )
+    # Keep the best (lowest) distance seen for each distinct reference clause
+    best = {}
+    for embedding in segment_embeddings:
+        matches = service.similarity_search_by_vector_with_score(
+            embedding=embedding,
+            k=PER_SEGMENT_K,
+            filter={"contract_type": contract_type}
+        )
+        for doc, distance in matches:
+            key = (doc.metadata.get("clause_title"), doc.page_content)
+            if key not in best or distance < best[key][1]:
+                best[key] = (doc, distance)
 
-    results = db.similarity_search(
-        query=contract_text,
-        k=5,
-        filter={"contract_type": contract_type}
-    )
+    ranked = sorted(best.values(), key=lambda item: item[1])
+    results = [doc for doc, _ in ranked[:MAX_RESULTS]]
 
-    print("\n✅ Retrieved relevant clauses:\n")
+    print(f"\n✅ Retrieved relevant clauses ({len(segments)} segments searched):\n")
 
     for r in results:
         print(f"🔹 Clause Title : {r.metadata['clause_title']}")
@@ -35,4 +47,4 @@ def retrieve_clauses_node(state: dict):
         print(f"📌 Contract Type: {r.metadata['contract_type']}")
         print("-" * 70)
 
-    return {"retrieved_clauses": results}
+    return {"retrieved_clauses": results, "contract_segments": segments}
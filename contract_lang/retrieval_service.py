@@ -0,0 +1,142 @@
+import sys
+import threading
+import time
+
+from langchain_chroma import Chroma
+from langchain_huggingface import HuggingFaceEmbeddings
+
+PERSIST_DIR = "vector_db"
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class RetrievalService:
+    """
+    Holds one embedding model and one persistent Chroma handle
+    that every contract_lang node shares for the life of the process.
+    """
+
+    def __init__(self, persist_dir: str = PERSIST_DIR, model_name: str = EMBEDDING_MODEL):
+        self.persist_dir = persist_dir
+        self.model_name = model_name
+
+        self._lock = threading.RLock()
+        self._embeddings = None
+        self._db = None
+
+        self.load_seconds = 0.0
+        self.query_count = 0
+        self.query_seconds = 0.0
+
+    @property
+    def embeddings(self) -> HuggingFaceEmbeddings:
+        self._ensure_loaded()
+        return self._embeddings
+
+    @property
+    def db(self) -> Chroma:
+        self._ensure_loaded()
+        return self._db
+
+    def _ensure_loaded(self):
+        if self._db is not None:
+            return
+
+        with self._lock:
+            if self._db is not None:
+                return
+
+            start = time.perf_counter()
+            embeddings = HuggingFaceEmbeddings(model_name=self.model_name)
+            db = Chroma(
+                persist_directory=self.persist_dir,
+                embedding_function=embeddings
+            )
+            self._embeddings = embeddings
+            self._db = db
+            self.load_seconds = time.perf_counter() - start
+
+            print(f"✅ Retrieval service loaded in {self.load_seconds:.2f}s")
+
+    def warm_up(self):
+        """Load the model and collection and run one embedding so the first real query is fast."""
+        self.embeddings.embed_query("warm up")
+        return self.get_stats()
+
+    def add_documents(self, documents):
+        with self._lock:
+            return self.db.add_documents(documents)
+
+    def similarity_search(self, query: str, k: int = 5, filter: dict = None):
+        start = time.perf_counter()
+        results = self.db.similarity_search(query=query, k=k, filter=filter)
+        self._record_query(time.perf_counter() - start)
+        return results
+
+    def similarity_search_by_vector(self, embedding, k: int = 5, filter: dict = None):
+        start = time.perf_counter()
+        results = self.db.similarity_search_by_vector(embedding=embedding, k=k, filter=filter)
+        self._record_query(time.perf_counter() - start)
+        return results
+
+    def embed_documents(self, texts):
+        """Embed many texts in one batched model call."""
+        return self.embeddings.embed_documents(texts)
+
+    def similarity_search_by_vector_with_score(self, embedding, k: int = 5, filter: dict = None):
+        start = time.perf_counter()
+        results = self.db.similarity_search_by_vector_with_relevance_scores(embedding=embedding, k=k, filter=filter)
+        self._record_query(time.perf_counter() - start)
+        return results
+
+    def _record_query(self, seconds: float):
+        with self._lock:
+            self.query_count += 1
+            self.query_seconds += seconds
+
+    def get_stats(self) -> dict:
+        loaded = self._db is not None
+        stats = {
+            "loaded": loaded,
+            "load_seconds": round(self.load_seconds, 3),
+            "query_count": self.query_count,
+            "avg_query_ms": round(self.query_seconds * 1000 / self.query_count, 2) if self.query_count else 0.0,
+            "model_bytes": self._model_bytes() if loaded else 0,
+            "process_peak_rss_bytes": _peak_rss_bytes(),
+        }
+        if loaded:
+            try:
+                stats["collection_count"] = self._db._collection.count()
+            except Exception:
+                stats["collection_count"] = None
+        return stats
+
+    def _model_bytes(self) -> int:
+        model = getattr(self._embeddings, "_client", None) or getattr(self._embeddings, "client", None)
+        try:
+            return sum(p.numel() * p.element_size() for p in model.parameters())
+        except Exception:
+            return 0
+
+
+def _peak_rss_bytes() -> int:
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_retrieval_service() -> RetrievalService:
+    """Return the process-wide retrieval service, creating it on first use."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = RetrievalService()
+    return _service
@@ -0,0 +1,92 @@
+import re
+
+# MiniLM truncates at 256 word pieces, roughly 1000 characters of legal English
+MAX_SEGMENT_CHARS = 1000
+MAX_SEGMENTS = 40
+# Sub-clauses shorter than this are folded into their neighbour
+MIN_SEGMENT_CHARS = 200
+
+NUMBERED_HEADING = re.compile(
+    r"""^(
+        (article|section|clause|schedule|annex|exhibit)\s+[\dIVXLC]+\b   # Article 5, Section IV
+        | \d+(\.\d+)*[.)]\s+\S                                        # 1. Term / 4) Fees
+        | \d+(\.\d+)+\s+\S                                            # 2.3 Fees
+        | \([a-z\d]{1,4}\)\s+\S                                        # (a) / (iv) / (12)
+    )""",
+    re.IGNORECASE | re.VERBOSE,
+)
+CAPS_HEADING = re.compile(r"[A-Z][A-Z0-9 ,&/\-]{3,80}")
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped:
+        return False
+    return bool(NUMBERED_HEADING.match(stripped) or CAPS_HEADING.fullmatch(stripped))
+
+
+def _split_long(segment: str, max_chars: int):
+    """Split an oversized segment on paragraph, then sentence boundaries."""
+    if len(segment) <= max_chars:
+        return [segment]
+
+    pieces = re.split(r"\n\s*\n|(?<=[.;:])\s+", segment)
+    chunks, current = [], ""
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        while len(piece) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(piece[:max_chars])
+            piece = piece[max_chars:]
+        if current and len(current) + len(piece) + 1 > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}".strip()
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def segment_contract(text: str, max_chars: int = MAX_SEGMENT_CHARS, max_segments: int = MAX_SEGMENTS):
+    """
+    Split contract text into clause-sized segments.
+
+    Lines that look like headings or clause numbers ("Section 4", "2.1",
+    "(a)", "TERMINATION") start a new segment. Segments longer than
+    max_chars are split further, so every returned segment fits the
+    embedding model without truncation.
+
+    If there are more than max_segments, an evenly spaced sample of
+    max_segments segments is returned so retrieval cost stays bounded.
+    The sample spans the whole document, but the skipped segments are
+    not searched; pass max_segments=None to keep every segment.
+    """
+    segments, current = [], []
+    for line in text.splitlines():
+        if _is_heading(line) and current:
+            segments.append("\n".join(current).strip())
+            current = []
+        if line.strip():
+            current.append(line.strip())
+    if current:
+        segments.append("\n".join(current).strip())
+
+    chunks = []
+    for segment in segments:
+        for piece in _split_long(segment, max_chars):
+            if chunks and len(chunks[-1]) < MIN_SEGMENT_CHARS and len(chunks[-1]) + len(piece) < max_chars:
+                chunks[-1] = f"{chunks[-1]}\n{piece}"
+            else:
+                chunks.append(piece)
+
+    if max_segments and len(chunks) > max_segments:
+        # Merging neighbours would push segments past the model's limit, so sample instead
+        step = (len(chunks) - 1) / max(max_segments - 1, 1)
+        chunks = [chunks[round(i * step)] for i in range(max_segments)]
+
+    return chunks
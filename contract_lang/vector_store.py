@@ -1,19 +1,14 @@
 import json
-from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.documents import Document
-import os
+from retrieval_service import get_retrieval_service
 
-PERSIST_DIR = "vector_db"
 CLAUSE_FILE = "clause.json"
 
 
 def init_vector_db():
     print("🔄 Initializing Vector Database...")
 
-    embeddings = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2"
-    )
+    service = get_retrieval_service()
 
     with open(CLAUSE_FILE, "r", encoding="utf-8") as f:
         clauses = json.load(f)
@@ -33,10 +28,6 @@ def init_vector_db():
                 )
             )
 
-    db = Chroma.from_documents(
-        documents=documents,
-        embedding=embeddings,
-        persist_directory=PERSIST_DIR
-    )
+    service.add_documents(documents)
 
     print("✅ Vector DB created and clauses embedded")
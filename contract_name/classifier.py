@@ -1,12 +1,19 @@
 import json
+import sys
+from pathlib import Path
 from typing import TypedDict
 
-from pypdf import PdfReader
-from docx import Document
-import requests
+# The shared extraction and Ollama packages live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from contract_extract import extract_text
+from ollama_client import generate
 
 from langgraph.graph import StateGraph, END
 
+# Only this much of the contract is sent to the model, so only the pages holding it are parsed
+MAX_CHARS = 3000
+MODEL = "phi3:mini"   # must match `ollama list`
+
 
 class ContractState(TypedDict, total=False):
     file_path: str
@@ -19,28 +26,13 @@ class ContractState(TypedDict, total=False):
 def extract_text_node(state: ContractState):
     file_path = state["file_path"]
 
-    if file_path.lower().endswith(".pdf"):
-        reader = PdfReader(file_path)
-        text = "\n".join(
-            page.extract_text() for page in reader.pages if page.extract_text()
-        )
-
-    elif file_path.lower().endswith(".docx"):
-        doc = Document(file_path)
-        text = "\n".join(p.text for p in doc.paragraphs)
-
-    else:
+    if not file_path.lower().endswith((".pdf", ".docx")):
         raise ValueError("Only PDF and DOCX files are supported")
 
-    return {"document_text": text}
+    return {"document_text": extract_text(file_path, max_chars=MAX_CHARS)}
 
 
 def classify_contract_node(state: ContractState):
-    import json
-    import requests
-
- 
-    MAX_CHARS = 3000
     text = state["document_text"][:MAX_CHARS]
 
     prompt = f"""
@@ -58,29 +50,21 @@ Text:
 JSON:
 """
 
-    response = requests.post(
-        "http://localhost:11434/api/generate",
-        json={
-            "model": "phi3:mini",   # must match `ollama list`
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0,
-                "num_predict": 200
-            }
+    # Raises ollama_client.OllamaError (a RuntimeError) once retries are exhausted
+    raw = generate(
+        MODEL,
+        prompt,
+        options={
+            "temperature": 0,
+            "num_predict": 200
         },
         timeout=600
     )
 
-    if response.status_code != 200:
-        raise RuntimeError(f"Ollama error: {response.text}")
-
-    data = response.json()
-
     try:
-        result = json.loads(data["response"])
+        result = json.loads(raw)
     except Exception:
-        raise RuntimeError(f"Invalid JSON from model: {data['response']}")
+        raise RuntimeError(f"Invalid JSON from model: {raw}")
 
     return {
         "contract_type": result.get("contract_type", "Unknown"),
@@ -1,11 +1,18 @@
 import json
-import requests
 import re
+import sys
+from pathlib import Path
+
+# The shared Ollama client lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from ollama_client import generate
 
 from parser_2 import extract_pdf_text, extract_docx_text
 
-OLLAMA_URL = "http://localhost:11434/api/generate"
 MODEL = "llama3.2:latest"
+# The prompt uses the first 3000 characters plus headings and keywords;
+# scanning roughly the first five pages for those is enough, so the rest is never parsed
+CLASSIFY_MAX_CHARS = 15000
 
 
 def extract_key_sections(text: str) -> str:
@@ -48,9 +55,9 @@ KEYWORDS:
 def classify_contract(file_path: str) -> dict:
     # -------- Extract ----------
     if file_path.lower().endswith(".pdf"):
-        result = extract_pdf_text(file_path)
+        result = extract_pdf_text(file_path, max_chars=CLASSIFY_MAX_CHARS)
     elif file_path.lower().endswith(".docx"):
-        result = extract_docx_text(file_path)
+        result = extract_docx_text(file_path, max_chars=CLASSIFY_MAX_CHARS)
     else:
         return {"error": "Only PDF or DOCX supported"}
 
@@ -74,21 +81,16 @@ Return ONLY this JSON:
 }}
 """
 
-    response = requests.post(
-        OLLAMA_URL,
-        json={
-            "model": MODEL,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.05,
-                "num_predict": 120
-            }
+    raw = generate(
+        MODEL,
+        prompt,
+        options={
+            "temperature": 0.05,
+            "num_predict": 120
         },
         timeout=90
     )
 
-    raw = response.json()["response"]
     start = raw.find("{")
     end = raw.rfind("}") + 1
     result = json.loads(raw[start:end])
@@ -1,2 +1,8 @@
+import sys
+from pathlib import Path
+
+# The shared extraction package lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
 from .pdf_parser_2 import extract_pdf_text
 from .docx_parser_2 import extract_docx_text
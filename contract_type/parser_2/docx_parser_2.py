@@ -1,9 +1,8 @@
-from docx import Document
+from contract_extract import extract_text
 
-def extract_docx_text(file_path: str) -> dict:
+def extract_docx_text(file_path: str, max_chars: int = None) -> dict:
     try:
-        doc = Document(file_path)
-        text = "\n".join(p.text for p in doc.paragraphs)
+        text = extract_text(file_path, max_chars=max_chars)
 
         if not text.strip():
             return {"success": False, "error": "Empty DOCX"}
@@ -1,12 +1,9 @@
-import pdfplumber
+from contract_extract import extract_text
 
-def extract_pdf_text(file_path: str) -> dict:
+def extract_pdf_text(file_path: str, max_chars: int = None) -> dict:
     try:
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                if page.extract_text():
-                    text += page.extract_text() + "\n"
+        # With max_chars set, parsing stops at the first pages that provide it
+        text = extract_text(file_path, max_chars=max_chars)
 
         if not text.strip():
             return {"success": False, "error": "Empty PDF"}
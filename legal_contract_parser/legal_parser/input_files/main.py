@@ -1,6 +1,11 @@
 import os
-from parser.pdf_parser import parse_pdf
-from parser.docx_parser import parse_docx
+import sys
+import argparse
+
+# The shared extraction package lives at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from contract_extract import extract_text
+from contract_extract.batch import run as run_batch
 
 def save_output(text, filename, output_format):
     os.makedirs("output_files", exist_ok=True)
@@ -14,20 +19,29 @@ def save_output(text, filename, output_format):
 def parse_contract(file_path, output_format="txt"):
     ext = os.path.splitext(file_path)[1].lower()
 
-    if ext == ".pdf":
-        text = parse_pdf(file_path)
-
-    elif ext == ".docx":
-        text = parse_docx(file_path)
-
-    else:
+    if ext not in (".pdf", ".docx"):
         raise ValueError("Unsupported file format")
 
+    text = extract_text(file_path)
+
     if output_format == "md":
         text = "# Parsed Legal Contract\n" + text
 
     output_path = save_output(text, "parsed_contract", output_format)
     print("✅ Output saved at:", output_path)
 
+def parse_batch(inputs, output_format="txt", workers=None):
+    # Converts across a process pool; reruns skip files whose hash is unchanged
+    return run_batch(inputs, "output_files", output_format, workers)
+
 if __name__ == "__main__":
-    parse_contract("input_files/document.pdf", "md")
+    parser = argparse.ArgumentParser(description="Parse legal contracts to txt or md")
+    parser.add_argument("inputs", nargs="*", help="Files, directories or glob patterns to convert in parallel")
+    parser.add_argument("--format", choices=("txt", "md"), default="md")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if args.inputs:
+        parse_batch(args.inputs, args.format, args.workers)
+    else:
+        parse_contract("input_files/document.pdf", "md")
@@ -0,0 +1,13 @@
+"""
+Shared Ollama client for every project in this repository.
+"""
+
+from .client import OLLAMA_HOST, OllamaClient, OllamaError, generate, get_client
+
+__all__ = [
+    "OLLAMA_HOST",
+    "OllamaClient",
+    "OllamaError",
+    "generate",
+    "get_client",
+]
@@ -0,0 +1,181 @@
+"""
+Check the shared Ollama client and the classifiers against the stub server.
+
+Run from the repository root (no Ollama install or model needed):
+    python -m ollama_client.check
+
+Exits non-zero if any check fails.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from .client import OllamaClient, OllamaError
+from .stub import StubOllamaServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _client(server: StubOllamaServer, **kwargs) -> OllamaClient:
+    kwargs.setdefault("backoff_seconds", 0.01)
+    return OllamaClient(host=server.url, **kwargs)
+
+
+def check_keep_alive() -> str:
+    with StubOllamaServer() as server:
+        client = _client(server, keep_alive="45m")
+        for _ in range(5):
+            assert client.generate("stub", "hello", options={"temperature": 0}) == server.response
+        payload = server.requests[-1]["payload"]
+        assert payload["keep_alive"] == "45m" and payload["stream"] is False, payload
+        assert payload["options"] == {"temperature": 0}, payload
+        assert server.connections() == 1, f"{server.connections()} connections for 5 requests"
+    return "5 requests over 1 connection, keep_alive sent"
+
+
+def check_retry_then_succeed() -> str:
+    with StubOllamaServer() as server:
+        server.script = [503, "drop", 502]
+        client = _client(server)
+        assert client.generate("stub", "hello") == server.response
+        assert client.retries == 3 and len(server.requests) == 4, client.get_statistics()
+    return "503, dropped connection and 502 retried, 4th attempt answered"
+
+
+def check_retries_are_bounded() -> str:
+    with StubOllamaServer() as server:
+        server.script = [503] * 10
+        client = _client(server, max_retries=2)
+        try:
+            client.generate("stub", "hello")
+        except OllamaError:
+            pass
+        else:
+            raise AssertionError("expected OllamaError")
+        assert len(server.requests) == 3, len(server.requests)
+    return "gave up after 3 attempts"
+
+
+def check_client_errors_not_retried() -> str:
+    with StubOllamaServer() as server:
+        server.script = [404]
+        client = _client(server)
+        try:
+            client.generate("missing-model", "hello")
+        except OllamaError as e:
+            assert "404" in str(e), e
+        else:
+            raise AssertionError("expected OllamaError")
+        assert len(server.requests) == 1, len(server.requests)
+    return "404 raised after 1 attempt"
+
+
+def check_read_timeout_not_retried() -> str:
+    with StubOllamaServer() as server:
+        server.script = [("delay", 1.0)]
+        client = _client(server)
+        start = time.perf_counter()
+        try:
+            client.generate("stub", "hello", timeout=0.2)
+        except OllamaError:
+            pass
+        else:
+            raise AssertionError("expected OllamaError")
+        assert len(server.requests) == 1 and time.perf_counter() - start < 1.0
+    return "timed out once without retrying"
+
+
+def check_unreachable() -> str:
+    with StubOllamaServer() as server:
+        url = server.url
+    client = OllamaClient(host=url, max_retries=2, backoff_seconds=0.01)
+    try:
+        client.generate("stub", "hello")
+    except OllamaError as e:
+        assert "gave up after 3 attempts" in str(e), e
+    else:
+        raise AssertionError("expected OllamaError")
+    return "connection refused retried twice, then raised"
+
+
+def check_host_without_scheme() -> str:
+    with StubOllamaServer() as server:
+        host, port = server.httpd.server_address[:2]
+        client = OllamaClient(host=f"{host}:{port}", backoff_seconds=0.01)
+        assert client.generate("stub", "hello") == server.response
+    client = OllamaClient(host="ftp://127.0.0.1:1", max_retries=0)
+    try:
+        client.generate("stub", "hello")
+    except OllamaError:
+        pass
+    else:
+        raise AssertionError("expected OllamaError")
+    return "bare host:port treated as http, unsupported scheme raised as OllamaError"
+
+
+CLASSIFIER_SCRIPT = """
+import sys
+sys.path.insert(0, {repo!r})
+sys.path.insert(0, {contract_type!r})
+from contract_name.classifier import classify_contract_node
+from llm.classifier import classify_contract
+
+for _ in range(3):
+    a = classify_contract_node({{"document_text": "This Non-Disclosure Agreement is made between the parties."}})
+    b = classify_contract({docx!r})
+assert a == {{"contract_type": "NDA", "industry": "IT"}}, a
+assert b == {{"contract_type": "NDA", "industry": "IT", "confidence": 0.9}}, b
+"""
+
+
+def check_classifiers() -> str:
+    from docx import Document
+
+    with StubOllamaServer() as server, tempfile.TemporaryDirectory() as tmp:
+        docx = os.path.join(tmp, "nda.docx")
+        doc = Document()
+        doc.add_paragraph("NON-DISCLOSURE AGREEMENT")
+        doc.add_paragraph("The parties agree to keep confidential information confidential.")
+        doc.save(docx)
+
+        script = CLASSIFIER_SCRIPT.format(repo=REPO_ROOT, contract_type=os.path.join(REPO_ROOT, "contract_type"), docx=docx)
+        env = {**os.environ, "OLLAMA_HOST": server.url, "CONTRACT_EXTRACT_CACHE": "0"}
+        result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=120)
+        assert result.returncode == 0, result.stderr.strip().splitlines()[-1] if result.stderr else result.returncode
+
+        models = {r["payload"]["model"] for r in server.requests}
+        assert len(server.requests) == 6 and server.connections() == 1, (len(server.requests), server.connections())
+        assert all("keep_alive" in r["payload"] for r in server.requests)
+    return f"both classifiers parsed the stub's answer; 6 calls to {sorted(models)} over 1 connection"
+
+
+CHECKS: List[Tuple[str, Callable[[], str]]] = [
+    ("keep-alive", check_keep_alive),
+    ("retry then succeed", check_retry_then_succeed),
+    ("bounded retries", check_retries_are_bounded),
+    ("client errors", check_client_errors_not_retried),
+    ("read timeout", check_read_timeout_not_retried),
+    ("unreachable server", check_unreachable),
+    ("host without scheme", check_host_without_scheme),
+    ("classifiers", check_classifiers),
+]
+
+
+def main():
+    failed = 0
+    for name, check in CHECKS:
+        try:
+            print(f"ok    {name}: {check()}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {name}: {type(e).__name__}: {e}")
+    print(f"\n{len(CHECKS) - failed}/{len(CHECKS)} checks passed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
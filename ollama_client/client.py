@@ -0,0 +1,229 @@
+"""
+Pooled HTTP client for a local Ollama server.
+
+One requests.Session per process keeps connections to Ollama alive
+between calls, transient failures are retried with exponential backoff,
+and every request carries a keep_alive hint so the model stays loaded in
+memory between classifications instead of being reloaded each time.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+# How long Ollama keeps the model loaded after a request ("30m", "1h", or seconds; -1 keeps it loaded)
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+OLLAMA_CONNECT_TIMEOUT = float(os.environ.get("OLLAMA_CONNECT_TIMEOUT", "5"))
+OLLAMA_MAX_RETRIES = int(os.environ.get("OLLAMA_MAX_RETRIES", "3"))
+OLLAMA_BACKOFF_SECONDS = float(os.environ.get("OLLAMA_BACKOFF_SECONDS", "0.5"))
+OLLAMA_POOL_SIZE = int(os.environ.get("OLLAMA_POOL_SIZE", "4"))
+# Busy or restarting server; anything else is a real error and is raised at once
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_BACKOFF_SECONDS = 30.0
+
+_client: Optional["OllamaClient"] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
+class OllamaError(RuntimeError):
+    """Raised when Ollama returns an error or cannot be reached after all retries."""
+
+
+def normalize_host(host: str) -> str:
+    """
+    Turn an OLLAMA_HOST value into a base URL.
+
+    Ollama itself accepts a bare "host:port" (e.g. "0.0.0.0:11434"), so a
+    value without a scheme is taken to be plain HTTP.
+    """
+    host = host.strip().rstrip("/")
+    return host if "://" in host else "http://" + host
+
+
+OLLAMA_HOST = normalize_host(OLLAMA_HOST)
+
+
+class OllamaClient:
+    """Keep-alive Ollama client with a bounded connection pool and retries."""
+
+    def __init__(
+        self,
+        host: str = OLLAMA_HOST,
+        keep_alive: Union[str, int] = OLLAMA_KEEP_ALIVE,
+        max_retries: int = OLLAMA_MAX_RETRIES,
+        backoff_seconds: float = OLLAMA_BACKOFF_SECONDS,
+        pool_size: int = OLLAMA_POOL_SIZE,
+        connect_timeout: float = OLLAMA_CONNECT_TIMEOUT
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            host: Base URL of the Ollama server; "http://" is assumed when no scheme is given
+            keep_alive: keep_alive hint sent with every request
+            max_retries: Retries after the first attempt for connection errors and retryable statuses
+            backoff_seconds: Base delay, doubled after every failed attempt
+            pool_size: Connections kept open to the server
+            connect_timeout: Seconds to wait for a connection before the attempt counts as failed
+        """
+        self.host = normalize_host(host)
+        self.keep_alive = keep_alive
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.connect_timeout = connect_timeout
+
+        self.requests = 0
+        self.retries = 0
+
+        self.session = requests.Session()
+        # Retries are handled in _post so they can back off; the adapter only pools connections
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before the next attempt: Retry-After if the server sent one, else jittered exponential."""
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_BACKOFF_SECONDS)
+            except ValueError:
+                pass
+        delay = self.backoff_seconds * (2 ** attempt)
+        return min(delay * random.uniform(0.5, 1.0), MAX_BACKOFF_SECONDS)
+
+    def _post(self, path: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        POST a JSON payload, retrying transient failures.
+
+        Read timeouts are not retried: the model was already working on the
+        request, and trying again would only multiply the wait.
+
+        Args:
+            path: API path such as "/api/generate"
+            payload: JSON body
+            timeout: Seconds to wait for the response once connected
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            OllamaError: On a non-retryable error or when retries are exhausted
+        """
+        url = self.host + path
+        for attempt in range(self.max_retries + 1):
+            self.requests += 1
+            retry_after = None
+            try:
+                response = self.session.post(url, json=payload, timeout=(self.connect_timeout, timeout))
+            except requests.exceptions.ReadTimeout as e:
+                raise OllamaError(f"Ollama did not answer within {timeout}s: {e}") from e
+            except requests.exceptions.ConnectionError as e:
+                error = f"Cannot reach Ollama at {self.host}: {e}"
+            except requests.exceptions.RequestException as e:
+                # Bad URL or scheme and the like: retrying cannot help
+                raise OllamaError(f"Invalid request to Ollama at {self.host}: {e}") from e
+            else:
+                if response.status_code == 200:
+                    try:
+                        return response.json()
+                    except ValueError as e:
+                        raise OllamaError(f"Invalid response from Ollama: {response.text[:200]}") from e
+                error = f"Ollama error {response.status_code}: {response.text}"
+                if response.status_code not in RETRY_STATUSES:
+                    raise OllamaError(error)
+                retry_after = response.headers.get("Retry-After")
+
+            if attempt == self.max_retries:
+                raise OllamaError(f"{error} (gave up after {attempt + 1} attempts)")
+            self.retries += 1
+            time.sleep(self._backoff(attempt, retry_after))
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        timeout: float = 300,
+        **extra: Any
+    ) -> str:
+        """
+        Run a non-streaming completion.
+
+        Args:
+            model: Model name as listed by `ollama list`
+            prompt: Prompt text
+            options: Model options such as temperature and num_predict
+            timeout: Seconds to wait for the completion
+            **extra: Further /api/generate fields, e.g. format="json"
+
+        Returns:
+            The model's response text
+
+        Raises:
+            OllamaError: If the request fails
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+            **extra
+        }
+        if options:
+            payload["options"] = options
+        data = self._post("/api/generate", payload, timeout)
+        if "response" not in data:
+            raise OllamaError(f"Ollama response has no text: {data}")
+        return data["response"]
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Get request counters.
+
+        Returns:
+            Dictionary with attempts made and how many of them were retries
+        """
+        return {"requests": self.requests, "retries": self.retries}
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+
+def get_client() -> OllamaClient:
+    """
+    Return the process-wide client, creating it on first use.
+
+    A forked process gets its own client rather than sharing the parent's
+    sockets.
+    """
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = OllamaClient()
+            _client_pid = os.getpid()
+        return _client
+
+
+def generate(model: str, prompt: str, options: Optional[Dict[str, Any]] = None, timeout: float = 300, **extra: Any) -> str:
+    """
+    Run a completion on the process-wide client.
+
+    Args:
+        model: Model name as listed by `ollama list`
+        prompt: Prompt text
+        options: Model options such as temperature and num_predict
+        timeout: Seconds to wait for the completion
+        **extra: Further /api/generate fields
+
+    Returns:
+        The model's response text
+    """
+    return get_client().generate(model, prompt, options=options, timeout=timeout, **extra)
@@ -0,0 +1,138 @@
+"""
+Minimal stand-in for an Ollama server, for exercising clients without a model.
+
+    python -m ollama_client.stub --port 11435
+    cd contract_type && OLLAMA_HOST=http://127.0.0.1:11435 python main2.py
+
+It answers /api/generate with a fixed JSON classification, records every
+request with the client port it arrived on (so connection reuse can be
+checked), and can be scripted to fail the next requests with an HTTP
+status, a dropped connection or a delay.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Union
+
+DEFAULT_RESPONSE = json.dumps({"contract_type": "NDA", "industry": "IT", "confidence": 0.9})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # A client that gave up (read timeout) is expected here, not an error
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubOllamaServer:
+    """Threaded HTTP/1.1 server imitating Ollama's /api/generate."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, response: str = DEFAULT_RESPONSE):
+        """
+        Initialize the server (call start() or use it as a context manager).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind; 0 picks a free one
+            response: Text returned as the model's response
+        """
+        self.response = response
+        self.requests: List[Dict[str, Any]] = []
+        # Each entry is consumed by one request: an HTTP status, "drop", or ("delay", seconds)
+        self.script: List[Union[int, str, tuple]] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub._lock:
+                    stub.requests.append({
+                        "path": self.path,
+                        "client_port": self.client_address[1],
+                        "payload": json.loads(body or b"{}")
+                    })
+                    action = stub.script.pop(0) if stub.script else None
+
+                if action == "drop":
+                    self.close_connection = True
+                    self.connection.close()
+                    return
+                if isinstance(action, tuple) and action[0] == "delay":
+                    time.sleep(action[1])
+                    action = None
+                if isinstance(action, int):
+                    self._send(action, {"error": f"stub failure {action}"})
+                elif self.path != "/api/generate":
+                    self._send(404, {"error": "not found"})
+                else:
+                    self._send(200, {"model": "stub", "response": stub.response, "done": True})
+
+            def _send(self, status: int, data: Dict[str, Any]):
+                payload = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.httpd = _Server((host, port), Handler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def connections(self) -> int:
+        """Number of distinct client connections seen so far."""
+        with self._lock:
+            return len({r["client_port"] for r in self.requests})
+
+    def start(self) -> "StubOllamaServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--response", default=DEFAULT_RESPONSE, help="Text returned as the model's response")
+    args = parser.parse_args()
+
+    server = StubOllamaServer(args.host, args.port, args.response)
+    print(f"Stub Ollama listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
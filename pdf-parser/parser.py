@@ -1,18 +1,28 @@
 import os
-from PyPDF2 import PdfReader
+import sys
+import argparse
+
+# The shared extraction package lives at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from contract_extract import extract_text
+from contract_extract.batch import run as run_batch
+
+parser = argparse.ArgumentParser(description="Convert contracts to text")
+parser.add_argument("inputs", nargs="*", help="Files, directories or glob patterns to convert in parallel")
+parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+args = parser.parse_args()
+
+if args.inputs:
+    # Batch mode: process pool, manifest in output_files/, reruns skip unchanged files
+    run_batch(args.inputs, "output_files", "txt", args.workers)
+    sys.exit(0)
 
 input_file = r"C:\Users\RISHIRAJSINGH\Downloads\SOFTWARE-NDA.pdf"
 output_file = "output_files/Employment_Agreement.txt"
 
 os.makedirs("output_files", exist_ok=True)
 
-reader = PdfReader(input_file)
-text = ""
-
-for page in reader.pages:
-    page_text = page.extract_text()
-    if page_text:
-        text += page_text + "\n"
+text = extract_text(input_file)
 
 with open(output_file, "w", encoding="utf-8") as file:
     file.write(text)